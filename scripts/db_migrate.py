@@ -1,6 +1,10 @@
 """Simple DB migration runner for development.
 
-Adds `ir_json` and `plantuml_text` to `diagram_ir_versions` if missing.
+Adds `ir_json` and `plantuml_text` to `diagram_ir_versions` if missing, and
+unique `(session_id, version)` indexes on `images` and `diagram_ir_versions`.
+Databases that already hold duplicate versions (left by the old read-then-insert
+race) are reported and the migration stops before creating the indexes: output
+file names embed the version, so the rows cannot be renumbered automatically.
 """
 from __future__ import annotations
 
@@ -8,17 +12,46 @@ from sqlalchemy import create_engine, text
 from src.utils.config import settings
 
 
+def _duplicate_versions(conn, table: str) -> list:
+    return conn.execute(
+        text(
+            f"SELECT session_id, version, count(*) FROM {table} "
+            "GROUP BY session_id, version HAVING count(*) > 1 ORDER BY session_id, version"
+        )
+    ).all()
+
+
 def main() -> int:
     # Normalize URL for SQLAlchemy (remove +psycopg for psql-like URLs)
     db_url = settings.database_url
     engine = create_engine(db_url)
     alter_ir_json = "ALTER TABLE diagram_ir_versions ADD COLUMN IF NOT EXISTS ir_json JSONB"
     alter_plantuml = "ALTER TABLE diagram_ir_versions ADD COLUMN IF NOT EXISTS plantuml_text TEXT"
+    index_images = (
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_images_session_version ON images (session_id, version)"
+    )
+    index_ir_versions = (
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_diagram_ir_versions_session_version "
+        "ON diagram_ir_versions (session_id, version)"
+    )
     with engine.connect() as conn:
         conn.execute(text(alter_ir_json))
         conn.execute(text(alter_plantuml))
+        duplicates = {table: _duplicate_versions(conn, table) for table in ("images", "diagram_ir_versions")}
+        if any(duplicates.values()):
+            conn.commit()
+            for table, rows in duplicates.items():
+                for session_id, version, count in rows:
+                    print(f"{table}: session {session_id} has {count} rows with version {version}")
+            print(
+                "Duplicate (session_id, version) rows found; resolve them (their files are named after the "
+                "version) and re-run to create the unique indexes."
+            )
+            return 1
+        conn.execute(text(index_images))
+        conn.execute(text(index_ir_versions))
         conn.commit()
-    print("Migration applied: ir_json, plantuml_text added (if missing)")
+    print("Migration applied: ir_json, plantuml_text, (session_id, version) indexes added (if missing)")
     return 0
 
 
@@ -1,6 +1,9 @@
 """Database session and engine."""
 from __future__ import annotations
 
+from typing import Any
+
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
@@ -11,5 +14,15 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def _json_dumps(value: Any) -> str:
+    """Serialize JSON columns (IR payloads, styling plans) with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+engine = create_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
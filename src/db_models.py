@@ -4,7 +4,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, JSON, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -94,6 +94,9 @@ class PlanExecution(Base):
 
 class Image(Base):
     __tablename__ = "images"
+    __table_args__ = (UniqueConstraint("session_id", "version", name="uq_images_session_version"),)
+    # version is computed by the INSERT; fetch it back via RETURNING.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sessions.id"))
@@ -127,6 +130,8 @@ class DiagramFile(Base):
 
 class DiagramIR(Base):
     __tablename__ = "diagram_ir_versions"
+    __table_args__ = (UniqueConstraint("session_id", "version", name="uq_diagram_ir_versions_session_version"),)
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sessions.id"))
@@ -5,6 +5,7 @@ from pathlib import Path
 
 import requests
 import re
+from requests.adapters import HTTPAdapter
 
 from src.utils.config import settings
 from src.utils.file_utils import ensure_dir
@@ -14,9 +15,27 @@ from src.utils.plantuml_encode import plantuml_encode
 _MAX_GET_URL_LEN = 2000
 
 
+def _build_http_session() -> requests.Session:
+    # One pooled connection per concurrent render worker, kept alive across
+    # render_diagrams calls (whose worker threads are short-lived).
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=max(settings.max_render_workers, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_HTTP_SESSION = _build_http_session()
+
+
+def _http_session() -> requests.Session:
+    """Return the process-wide keep-alive session for the PlantUML server."""
+    return _HTTP_SESSION
+
+
 def _post_plantuml(url: str, plantuml_text: str) -> requests.Response:
     headers = {"Content-Type": "text/plain; charset=utf-8"}
-    return requests.post(url, data=plantuml_text.encode("utf-8"), headers=headers, timeout=30)
+    return _http_session().post(url, data=plantuml_text.encode("utf-8"), headers=headers, timeout=30)
 
 
 def _raise_for_status(response: requests.Response, context: str) -> None:
@@ -81,7 +100,7 @@ def render_plantuml_png(plantuml_text: str, output_name: str) -> str:
         response = _post_plantuml(settings.plantuml_server_url, cleaned)
         _raise_for_status(response, "PlantUML POST")
     else:
-        response = requests.get(url, timeout=30)
+        response = _http_session().get(url, timeout=30)
         try:
             response.raise_for_status()
         except requests.HTTPError:
@@ -106,7 +125,7 @@ def render_plantuml_svg(plantuml_text: str, output_name: str) -> str:
         response = _post_plantuml(svg_base, cleaned)
         _raise_for_status(response, "PlantUML POST")
     else:
-        response = requests.get(url, timeout=30)
+        response = _http_session().get(url, timeout=30)
         try:
             response.raise_for_status()
         except requests.HTTPError:
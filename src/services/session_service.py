@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session as DbSession
 
 from src.db_models import (
@@ -727,6 +727,7 @@ def _handle_llm_diagram_step(
         prompt=None,
         reason=f"llm diagram: {target_type}",
         ir_id=ir_version.id,
+        version=version_seed,
     )
 
     audit = record_styling_audit(
@@ -807,12 +808,14 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
     intent = plan_result.get("intent", "clarify")
     plan_id_value = plan_result.get("plan_id") or str(uuid4())
     plan_uuid = _parse_uuid(plan_id_value)
+    # Stable log fields, built once rather than per executed step.
+    session_id_str = str(session.id)
+    log_extra = {"session_id": session_id_str, "plan_id": plan_id_value}
 
     logger.info(
         "Planner produced plan",
         extra={
-            "session_id": str(session.id),
-            "plan_id": plan_id_value,
+            **log_extra,
             "intent": intent,
             "step_count": len(plan_result.get("plan", []) or []),
         },
@@ -921,7 +924,7 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                 duration_ms = int((time.perf_counter() - start) * 1000)
                 logger.exception(
                     "Failed to render LLM diagram",
-                    extra={"session_id": str(session.id), "plan_id": str(plan_record.id)},
+                    extra={"session_id": session_id_str, "plan_id": str(plan_record.id)},
                 )
                 response_text = f"Unable to render provided diagram: {exc}"
                 record_trace(
@@ -1036,30 +1039,23 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
         exec_context = {
             "db": db,
             "session": session,
-            "session_id": str(session.id),
+            "session_id": session_id_str,
             "user_message": message,
             "plan_id": str(plan_record.id),
         }
 
         for call_args in execution_args_list:
-            logger.info(
-                "Executing MCP tool",
-                extra={
-                    "session_id": str(session.id),
-                    "plan_id": plan_id_value,
-                    "tool": tool_name,
-                    "step_index": step_index,
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Executing MCP tool",
+                    extra={**log_extra, "tool": tool_name, "step_index": step_index},
+                )
             start = time.perf_counter()
             try:
                 tool_output = mcp_registry.execute(tool_name, call_args, context=exec_context)
             except Exception as exc:
                 duration_ms = int((time.perf_counter() - start) * 1000)
-                logger.exception(
-                    "MCP tool failed",
-                    extra={"session_id": str(session.id), "plan_id": plan_id_value, "tool": tool_name},
-                )
+                logger.exception("MCP tool failed", extra={**log_extra, "tool": tool_name})
                 _record_plan_execution(
                     db,
                     plan_record,
@@ -1087,16 +1083,11 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                 break
             duration_ms = int((time.perf_counter() - start) * 1000)
             audit_id = tool_output.get("audit_id") or tool_output.get("auditId")
-            logger.info(
-                "MCP tool completed",
-                extra={
-                    "session_id": str(session.id),
-                    "plan_id": plan_id_value,
-                    "tool": tool_name,
-                    "audit_id": audit_id,
-                    "duration_ms": duration_ms,
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "MCP tool completed",
+                    extra={**log_extra, "tool": tool_name, "audit_id": audit_id, "duration_ms": duration_ms},
+                )
             _record_plan_execution(db, plan_record, step_index, tool_name, call_args, tool_output, audit_id, duration_ms)
             tool_results.append({"tool": tool_name, "output": tool_output})
 
@@ -1174,7 +1165,7 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                             try:
                                 updated_ir_json = _apply_patch_ops_to_ir(parent_ir_json, entry.get("patch_ops"))
                             except Exception as exc:
-                                logger.exception("Patch application failed", extra={"session_id": str(session.id), "error": str(exc)})
+                                logger.exception("Patch application failed", extra={"session_id": session_id_str, "error": str(exc)})
                                 # Record audit via styling_audit and continue safely
                                 record_styling_audit(
                                     db,
@@ -1289,12 +1280,7 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                     except Exception:
                         logger.exception(
                             "Failed to derive semantic intent",
-                            extra={
-                                "session_id": str(session.id),
-                                "plan_id": plan_id_value,
-                                "tool": tool_name,
-                                "diagram_type": diagram_type,
-                            },
+                            extra={**log_extra, "tool": tool_name, "diagram_type": diagram_type},
                         )
                     metadata_payload = metadata_cache.get(diagram_type)
                     if metadata_payload is None:
@@ -1378,6 +1364,7 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                 if svg_after and image_record:
                     diagram_type = _infer_diagram_type(image_record.file_path)
                     parent_ir = db.get(DiagramIR, image_record.ir_id) if getattr(image_record, "ir_id", None) else None
+                    # Shallow copy: the child row must not share the parent's dict.
                     inherited_ir_json = dict(parent_ir.ir_json) if parent_ir and parent_ir.ir_json else None
                     semantic_intent = None
                     intent_payload = None
@@ -1389,7 +1376,7 @@ def handle_message(db: DbSession, session: Session, message: str) -> dict:
                         except Exception:
                             logger.exception(
                                 "Failed to hydrate semantic intent from parent IR",
-                                extra={"session_id": str(session.id), "diagram_type": diagram_type},
+                                extra={"session_id": session_id_str, "diagram_type": diagram_type},
                             )
                     ir_version = _create_ir_version(
                         db,
@@ -1560,14 +1547,22 @@ def _create_image(
     reason: str,
     parent_image_id: UUID | None = None,
     ir_id: UUID | None = None,
+    version: int | None = None,
 ) -> Image:
-    last = db.execute(
-        select(Image).where(Image.session_id == session.id).order_by(Image.version.desc())
-    ).scalars().first()
+    # version (and the default parent) are computed inside the INSERT itself
+    # unless the caller already reserved one with _next_version (e.g. to name
+    # the file); the session row lock makes concurrent writers take turns.
+    _lock_session_versions(db, session.id)
     image = Image(
         session_id=session.id,
-        version=(last.version + 1) if last else 1,
-        parent_image_id=parent_image_id or (last.id if last else None),
+        version=version if version is not None else _next_version_expr(Image, session.id),
+        parent_image_id=parent_image_id
+        or select(Image.id)
+        .where(Image.session_id == session.id)
+        .order_by(Image.version.desc())
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery(),
         file_path=file_path,
         prompt=prompt,
         reason=reason,
@@ -1580,11 +1575,36 @@ def _create_image(
     return image
 
 
+def _lock_session_versions(db: DbSession, session_id: UUID) -> None:
+    """Lock the session row so version allocation is serialised per session.
+
+    Under READ COMMITTED two concurrent ``max(version) + 1`` INSERTs would
+    compute the same value; the second writer now waits here until the first
+    commits and then sees its row. The lock is released at commit/rollback.
+    """
+    db.execute(select(Session.id).where(Session.id == session_id).with_for_update())
+
+
+def _next_version_expr(model, session_id: UUID):
+    """Scalar subquery yielding the session's ``max(version) + 1`` (1 when empty)."""
+    return (
+        select(func.coalesce(func.max(model.version), 0) + 1)
+        .where(model.session_id == session_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+
 def _next_version(db: DbSession, session_id: UUID) -> int:
-    last = db.execute(
-        select(Image).where(Image.session_id == session_id).order_by(Image.version.desc())
-    ).scalars().first()
-    return (last.version + 1) if last else 1
+    """Next image version for the session, for naming output files.
+
+    Takes the session lock first, so the value cannot be claimed by another
+    writer before this transaction's ``_create_image`` stores it.
+    """
+    _lock_session_versions(db, session_id)
+    return db.execute(
+        select(func.coalesce(func.max(Image.version), 0) + 1).where(Image.session_id == session_id)
+    ).scalar_one()
 
 
 def _create_ir_version(
@@ -1598,25 +1618,23 @@ def _create_ir_version(
     plantuml_text: str | None = None,
     semantic_intent: SemanticAestheticIR | None = None,
 ) -> DiagramIR:
-    last = db.execute(
-        select(DiagramIR).where(DiagramIR.session_id == session.id).order_by(DiagramIR.version.desc())
-    ).scalars().first()
     if svg_text is None:
         logging.getLogger(__name__).warning("Creating IR version with empty svg_text for session %s diagram %s", session.id, diagram_type)
         svg_text = ""
 
-    payload = dict(ir_json or {})
+    payload = ir_json
     if semantic_intent:
         try:
-            payload["aesthetic_intent"] = semantic_intent.to_dict()
+            payload = {**(ir_json or {}), "aesthetic_intent": semantic_intent.to_dict()}
         except Exception:
             logging.getLogger(__name__).exception("Failed to serialize semantic intent for diagram %s", diagram_type)
     payload = payload or None
 
+    _lock_session_versions(db, session.id)
     ir_version = DiagramIR(
         session_id=session.id,
         diagram_type=diagram_type,
-        version=(last.version + 1) if last else 1,
+        version=_next_version_expr(DiagramIR, session.id),
         parent_ir_id=parent_ir_id,
         reason=reason,
         svg_text=svg_text,
@@ -1766,8 +1784,11 @@ def _parse_uuid(value: str) -> UUID:
 
 
 def _infer_diagram_type(path: str) -> str:
-    name = path.rsplit("/", 1)[-1]
-    parts = name.split("_")
-    if len(parts) >= 3:
-        return parts[-2]
-    return "diagram"
+    # "<session>_<type>_<version>.svg" -> "<type>"; partition instead of
+    # split to avoid building intermediate lists on this hot path.
+    name = path[path.rfind("/") + 1:]
+    head, sep, _ = name.rpartition("_")
+    if not sep:
+        return "diagram"
+    _, sep, diagram_type = head.rpartition("_")
+    return diagram_type if sep else "diagram"
@@ -1,6 +1,7 @@
 """Styling audit persistence helpers."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable, List
 from uuid import UUID
 import uuid
@@ -11,15 +12,21 @@ from sqlalchemy.orm import Session as DbSession
 from src.db_models import StylingAudit
 
 
+@lru_cache(maxsize=2048)
+def _uuid_from_text(value: str) -> UUID:
+    try:
+        return UUID(value)
+    except ValueError:
+        return uuid.uuid5(uuid.NAMESPACE_URL, value)
+
+
 def _coerce_uuid(value: UUID | str | None) -> UUID | None:
     if value is None:
         return None
     if isinstance(value, UUID):
         return value
-    try:
-        return UUID(str(value))
-    except ValueError:
-        return uuid.uuid5(uuid.NAMESPACE_URL, str(value))
+    # The same plan/diagram ids are coerced repeatedly within a request.
+    return _uuid_from_text(value if isinstance(value, str) else str(value))
 
 
 def record_styling_audit(
@@ -20,7 +20,7 @@ _PLANTUML_BLOCK_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
     (re.compile(r"file:\/\/", re.IGNORECASE), "file URI"),
 )
 
-_ALLOWED_SKINPARAM_KEYS = {
+_ALLOWED_SKINPARAM_KEYS = frozenset({
     "componentStyle",
     "roundcorner",
     "shadowing",
@@ -28,8 +28,10 @@ _ALLOWED_SKINPARAM_KEYS = {
     "defaultFontSize",
     "wrapWidth",
     "maxMessageSize",
-}
-_ALLOWED_SKINPARAM_KEYS_LOWER = {key.lower() for key in _ALLOWED_SKINPARAM_KEYS}
+})
+_ALLOWED_SKINPARAM_KEYS_LOWER = frozenset(key.lower() for key in _ALLOWED_SKINPARAM_KEYS)
+_SKINPARAM_RE = re.compile(r"skinparam\s+([a-z0-9_]+)", re.IGNORECASE)
+_SKINPARAM_LOWER_RE = re.compile(_SKINPARAM_RE.pattern)
 
 _MERMAID_BLOCK_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
     (re.compile(r"%%\s*\{\s*init", re.IGNORECASE), "init"),
@@ -40,6 +42,36 @@ _MERMAID_BLOCK_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
 )
 
 
+@dataclass(frozen=True)
+class _BlockScan:
+    """Block patterns fused into one alternation; group ``i`` maps to ``labels[i - 1]``."""
+
+    pattern: re.Pattern[str]
+    # Case-sensitive twin of ``pattern`` (all sources are lowercase) for
+    # scanning the pre-lowered text of ASCII payloads.
+    lower_pattern: re.Pattern[str]
+    labels: tuple[str, ...]
+    # Lowercase literals, one of which occurs in every possible match of an
+    # ASCII payload; when none is present the regex scan is skipped entirely.
+    triggers: tuple[str, ...]
+
+
+def _combine_patterns(patterns: Iterable[tuple[re.Pattern[str], str]], triggers: tuple[str, ...]) -> _BlockScan:
+    patterns = tuple(patterns)
+    source = "|".join(f"({pattern.pattern})" for pattern, _ in patterns)
+    return _BlockScan(
+        re.compile(source, re.IGNORECASE),
+        re.compile(source),
+        tuple(label for _, label in patterns),
+        triggers,
+    )
+
+
+# Each payload is scanned once with the fused pattern instead of once per entry.
+_PLANTUML_BLOCK_SCAN = _combine_patterns(_PLANTUML_BLOCK_PATTERNS, ("!", "skinparam", "url", "file:"))
+_MERMAID_BLOCK_SCAN = _combine_patterns(_MERMAID_BLOCK_PATTERNS, ("%%", "<", "javascript:"))
+
+
 @dataclass
 class DiagramValidationResult:
     format: str
@@ -56,40 +88,76 @@ class DiagramValidationError(ValueError):
         self.result = result
 
 
+_PLANTUML_ALIASES = frozenset({"plantuml", "plant", "puml"})
+_MERMAID_ALIASES = frozenset({"mermaid", "mmd"})
+
+
 def _normalize_format(diagram_format: str | None) -> str:
     token = (diagram_format or "").strip().lower()
-    if token in {"plantuml", "plant", "puml"}:
+    if token in _PLANTUML_ALIASES:
         return "plantuml"
-    if token in {"mermaid", "mmd"}:
+    if token in _MERMAID_ALIASES:
         return "mermaid"
     raise ValueError("Unknown diagram format: %s" % diagram_format)
 
 
+# Bounds markers normally sit on the first/last line; only this many chars at
+# each end are lowercased before falling back to a full-text scan.
+_BOUNDS_WINDOW = 64
+
+
 def _ensure_bounds(text: str, start_marker: str, end_marker: str, warnings: List[str]) -> str:
-    lowered = text.lower()
-    if start_marker.lower() not in lowered:
+    start_lower = start_marker.lower()
+    end_lower = end_marker.lower()
+    has_start = start_lower in text[:_BOUNDS_WINDOW].lower()
+    has_end = end_lower in text[-_BOUNDS_WINDOW:].lower()
+    if not (has_start and has_end):
+        lowered = text.lower()
+        has_start = has_start or start_lower in lowered
+        has_end = has_end or end_lower in lowered
+    if not has_start:
         warnings.append(f"Added {start_marker}")
         text = f"{start_marker}\n{text}"
-    if end_marker.lower() not in lowered:
+    if not has_end:
         warnings.append(f"Added {end_marker}")
         text = f"{text}\n{end_marker}"
     return text
 
 
-def _scan_patterns(text: str, patterns: Iterable[tuple[re.Pattern[str], str]]) -> List[str]:
-    blocked: List[str] = []
-    for pattern, label in patterns:
-        if pattern.search(text):
-            blocked.append(label)
-    return blocked
+def _scan_patterns(text: str, scan: _BlockScan, lowered: str, first_only: bool = False) -> List[str]:
+    # ASCII payloads are matched case-sensitively against the lowered text.
+    # Non-ASCII text keeps the IGNORECASE pattern: it folds some non-ASCII
+    # letters (e.g. dotless i) onto ASCII ones that str.lower() keeps.
+    if text.isascii():
+        if not any(trigger in lowered for trigger in scan.triggers):
+            return []
+        pattern, subject = scan.lower_pattern, lowered
+    else:
+        pattern, subject = scan.pattern, text
+    if first_only:
+        match = pattern.search(subject)
+        return [scan.labels[match.lastindex - 1]] if match else []
+    hits = {match.lastindex for match in pattern.finditer(subject)}
+    # Report labels in declaration order, once each, as the per-pattern scan did.
+    return [label for index, label in enumerate(scan.labels, 1) if index in hits]
 
 
-def _validate_skinparams(text: str) -> List[str]:
+def _validate_skinparams(text: str, lowered: str, first_only: bool = False) -> List[str]:
     blocked: List[str] = []
-    for match in re.finditer(r"skinparam\s+([a-z0-9_]+)", text, re.IGNORECASE):
-        key = match.group(1)
-        if key.lower() not in _ALLOWED_SKINPARAM_KEYS_LOWER:
-            blocked.append(f"skinparam {key}")
+    if not text.isascii():
+        for match in _SKINPARAM_RE.finditer(text):
+            key = match.group(1)
+            if key.lower() not in _ALLOWED_SKINPARAM_KEYS_LOWER:
+                blocked.append(f"skinparam {key}")
+                if first_only:
+                    break
+        return blocked
+    for match in _SKINPARAM_LOWER_RE.finditer(lowered):
+        if match.group(1) not in _ALLOWED_SKINPARAM_KEYS_LOWER:
+            # Offsets line up for ASCII, so report the key as originally written.
+            blocked.append(f"skinparam {text[match.start(1):match.end(1)]}")
+            if first_only:
+                break
     return blocked
 
 
@@ -116,7 +184,7 @@ _ROUNDED_LABEL_RE = re.compile(
 )
 
 # Characters that Mermaid would misinterpret as shape-syntax inside labels.
-_MERMAID_SPECIAL_CHARS = re.compile(r'[(){}]')
+_MERMAID_SPECIAL_CHARS = frozenset('(){}')
 
 
 def _quote_label_if_needed(m: re.Match, open_br: str, close_br: str) -> str:
@@ -125,7 +193,7 @@ def _quote_label_if_needed(m: re.Match, open_br: str, close_br: str) -> str:
     # Already quoted – leave as-is
     if label.startswith('"') and label.endswith('"'):
         return m.group(0)
-    if _MERMAID_SPECIAL_CHARS.search(label):
+    if not _MERMAID_SPECIAL_CHARS.isdisjoint(label):
         safe = label.replace('"', '#quot;')
         return f'{m.group("id")}{open_br}"{safe}"{close_br}'
     return m.group(0)
@@ -144,11 +212,14 @@ def _quote_mermaid_node_labels(line: str) -> str:
     return line
 
 
+# Bare "title ..." lines are invalid inside Mermaid graph/flowchart blocks.
+_MERMAID_TITLE_RE = re.compile(r"\s*title\s+", re.IGNORECASE)
+
+
 def _sanitize_mermaid(text: str) -> str:
     text = text.replace("\r", "")
-    # Remove bare "title ..." lines which are invalid inside Mermaid graph/flowchart blocks
     lines = text.split("\n")
-    cleaned = [line for line in lines if not re.match(r"^\s*title\s+", line, re.IGNORECASE)]
+    cleaned = [line for line in lines if not _MERMAID_TITLE_RE.match(line)]
     # Quote node labels that contain special characters like () {}
     cleaned = [_quote_mermaid_node_labels(line) for line in cleaned]
     return "\n".join(cleaned).strip()
@@ -161,8 +232,12 @@ def _sanitize_plantuml(text: str, warnings: List[str]) -> str:
     return stripped
 
 
-def validate_and_sanitize(diagram_text: str, diagram_format: str) -> DiagramValidationResult:
-    """Validate an LLM-provided diagram and normalize its contents."""
+def validate_and_sanitize(diagram_text: str, diagram_format: str, fast_fail: bool = False) -> DiagramValidationResult:
+    """Validate an LLM-provided diagram and normalize its contents.
+
+    With ``fast_fail`` the scan stops at the first blocked directive, so the
+    error lists only that one instead of every offending token.
+    """
     fmt = _normalize_format(diagram_format)
     warnings: List[str] = []
     blocked: List[str] = []
@@ -174,11 +249,13 @@ def validate_and_sanitize(diagram_text: str, diagram_format: str) -> DiagramVali
 
     if fmt == "plantuml":
         sanitized = _sanitize_plantuml(payload, warnings)
-        blocked.extend(_scan_patterns(sanitized, _PLANTUML_BLOCK_PATTERNS))
-        blocked.extend(_validate_skinparams(sanitized))
+        lowered = sanitized.lower()
+        blocked.extend(_scan_patterns(sanitized, _PLANTUML_BLOCK_SCAN, lowered, fast_fail))
+        if not (fast_fail and blocked):
+            blocked.extend(_validate_skinparams(sanitized, lowered, fast_fail))
     else:
         sanitized = _sanitize_mermaid(payload)
-        blocked.extend(_scan_patterns(sanitized, _MERMAID_BLOCK_PATTERNS))
+        blocked.extend(_scan_patterns(sanitized, _MERMAID_BLOCK_SCAN, sanitized.lower(), fast_fail))
 
     result = DiagramValidationResult(fmt, sanitized, warnings, blocked)
     if blocked:
@@ -5,27 +5,32 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
+
 from src.utils.config import settings
-from src.utils.file_utils import ensure_dir
+from src.utils.file_utils import atomic_write_bytes
+from src.utils.file_utils import ensure_dir_once
 from src.utils.file_utils import read_text_file
 
 
-def save_json(name: str, payload: Dict[str, Any]) -> str:
-    output_dir = ensure_dir(settings.output_dir)
+def save_json(name: str, payload: Dict[str, Any], pretty: bool = True) -> str:
+    """Write ``payload`` as indented JSON; pass ``pretty=False`` on hot internal paths."""
+    output_dir = ensure_dir_once(settings.output_dir)
     path = Path(output_dir) / name
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    atomic_write_bytes(path, orjson.dumps(payload, option=option))
     return str(path)
 
 
 def save_text(name: str, text: str) -> str:
-    output_dir = ensure_dir(settings.output_dir)
+    output_dir = ensure_dir_once(settings.output_dir)
     path = Path(output_dir) / name
-    path.write_text(text, encoding="utf-8")
+    atomic_write_bytes(path, text.encode("utf-8"))
     return str(path)
 
 
 def load_json(name: str) -> Dict[str, Any]:
-    output_dir = ensure_dir(settings.output_dir)
+    output_dir = ensure_dir_once(settings.output_dir)
     path = Path(output_dir) / name
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
@@ -33,7 +38,7 @@ def load_json(name: str) -> Dict[str, Any]:
 
 
 def load_text(name: str) -> str:
-    output_dir = ensure_dir(settings.output_dir)
+    output_dir = ensure_dir_once(settings.output_dir)
     path = Path(output_dir) / name
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
@@ -1,14 +1,12 @@
 """GitHub repository ingestion and lightweight analysis."""
 from __future__ import annotations
 
-import os
-import re
 import shutil
 import subprocess
 import tempfile
 from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 
 EXCLUDE_DIRS = {
@@ -35,6 +33,27 @@ KEY_FILES = {
     "values.yaml",
 }
 
+ENTRYPOINT_FILES = {"main.py", "app.py", "server.py", "index.js", "index.ts", "main.go"}
+
+# Files whose directory is treated as a service (monorepo root).
+SERVICE_MARKER_FILES = {"package.json", "pyproject.toml"}
+
+_KEY_FILE = 1
+_ENTRYPOINT = 2
+_SERVICE_MARKER = 4
+
+
+def _build_filename_actions() -> Dict[str, int]:
+    actions: Dict[str, int] = {}
+    for names, flag in ((KEY_FILES, _KEY_FILE), (ENTRYPOINT_FILES, _ENTRYPOINT), (SERVICE_MARKER_FILES, _SERVICE_MARKER)):
+        for name in names:
+            actions[name] = actions.get(name, 0) | flag
+    return actions
+
+
+# One lookup per filename classifies it into every category at once.
+_FILENAME_ACTIONS = _build_filename_actions()
+
 LANGUAGE_EXT = {
     ".py": "Python",
     ".js": "JavaScript",
@@ -51,8 +70,9 @@ LANGUAGE_EXT = {
 }
 
 
-def _run(cmd: List[str], cwd: str | None = None) -> str:
-    result = subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
+def _run(cmd: List[str], cwd: str | None = None) -> bytes:
+    # Raw bytes: callers decode only what they keep (see _tree_dirs).
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, check=True)
     return result.stdout.strip()
 
 
@@ -63,64 +83,124 @@ def _normalize_repo_url(repo_url: str) -> str:
     return normalized
 
 
-def clone_repo(repo_url: str) -> Tuple[str, str]:
+def clone_repo(safe_url: str) -> Tuple[str, str]:
+    """Clone ``safe_url`` into a temp dir and return ``(path, commit)``.
+
+    ``safe_url`` must already be normalized with ``_normalize_repo_url``;
+    ``ingest_github_repo`` does this once at the API boundary.
+    """
     temp_dir = tempfile.mkdtemp(prefix="archviz_repo_")
-    safe_url = _normalize_repo_url(repo_url)
-    _run(["git", "clone", "--depth", "1", safe_url, temp_dir])
-    commit = _run(["git", "rev-parse", "HEAD"], cwd=temp_dir)
+    # Blobless clone without checkout: analyze_repo only reads HEAD's tree,
+    # so no file contents are downloaded or written to disk.
+    _run(["git", "clone", "--depth", "1", "--filter=blob:none", "--no-checkout", "--single-branch", safe_url, temp_dir])
+    commit = _run(["git", "rev-parse", "HEAD"], cwd=temp_dir).decode("ascii")
     return temp_dir, commit
 
 
+# git ls-tree mode for gitlink (submodule) entries.
+_SUBMODULE_MODE = b"160000 "
+_EXCLUDE_DIRS_BYTES = frozenset(name.encode() for name in EXCLUDE_DIRS)
+
+
+def _tree_dirs(repo_path: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Group the files in HEAD's tree by directory, without a checkout.
+
+    Returns the top-level directory names and a ``{rel_dir: filenames}`` map
+    ("" for the root). Paths under EXCLUDE_DIRS and submodule entries are
+    skipped.
+    """
+    listing = _run(["git", "ls-tree", "-r", "-z", "HEAD"], cwd=repo_path)
+    # Most paths share a directory with their neighbours, so the exclusion
+    # check runs once per directory and its file list (None when excluded)
+    # is reused for the rest of its files.
+    # Parsing stays in bytes; names are decoded only once they pass the
+    # filter, and undecodable ones are replaced rather than failing ingest.
+    dirs: Dict[str, List[str]] = {}
+    dir_files: Dict[bytes, List[str] | None] = {}
+    for record in listing.split(b"\0"):
+        if record.startswith(_SUBMODULE_MODE):
+            continue
+        _, _, path = record.partition(b"\t")
+        if not path:
+            continue
+        rel_dir, _, filename = path.rpartition(b"/")
+        if rel_dir not in dir_files:
+            excluded = not _EXCLUDE_DIRS_BYTES.isdisjoint(rel_dir.split(b"/"))
+            dir_files[rel_dir] = None if excluded else dirs.setdefault(rel_dir.decode("utf-8", "replace"), [])
+        files = dir_files[rel_dir]
+        if files is not None:
+            files.append(filename.decode("utf-8", "replace"))
+    top_dirs = {rel_dir.partition(b"/")[0] for rel_dir in dir_files if rel_dir}
+    return sorted(name.decode("utf-8", "replace") for name in top_dirs - _EXCLUDE_DIRS_BYTES), dirs
+
+
+def _file_languages(filenames: List[str]) -> Iterator[str]:
+    """Yield the language of each filename with a known extension."""
+    for filename in filenames:
+        # Same rule as Path.suffix: a leading dot does not start a suffix.
+        dot = filename.rfind(".")
+        if dot > 0:
+            language = LANGUAGE_EXT.get(filename[dot:])
+            if language:
+                yield language
+
+
 def analyze_repo(repo_path: str, repo_url: str, commit: str) -> Dict[str, object]:
-    root = Path(repo_path)
-    repo_name = re.sub(r"\.git$", "", repo_url.rstrip("/").split("/")[-1])
+    repo_name = repo_url.rstrip("/").split("/")[-1].removesuffix(".git")
 
-    top_dirs = [p.name for p in root.iterdir() if p.is_dir() and p.name not in EXCLUDE_DIRS]
+    top_dirs, tree_dirs = _tree_dirs(repo_path)
     key_files: List[str] = []
     language_counts: Counter[str] = Counter()
-    services: List[str] = []
-    entrypoints: List[str] = []
-
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-        for filename in filenames:
-            rel = Path(dirpath, filename).relative_to(root).as_posix()
-            if filename in KEY_FILES:
-                key_files.append(rel)
-            ext = Path(filename).suffix
-            if ext in LANGUAGE_EXT:
-                language_counts[LANGUAGE_EXT[ext]] += 1
-            if filename in {"main.py", "app.py", "server.py", "index.js", "index.ts", "main.go"}:
-                entrypoints.append(rel)
-
-        if "package.json" in filenames or "pyproject.toml" in filenames:
-            services.append(Path(dirpath).relative_to(root).as_posix())
-
-    services = sorted(set([s for s in services if s and s != "."]))
-
+    services: Set[str] = set()
+    entrypoints: Set[str] = set()
+
+    for rel_dir, filenames in tree_dirs.items():
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        is_service = False
+        # The set intersection runs in C, so the Python-level work below is
+        # limited to the handful of files that actually match.
+        for filename in _FILENAME_ACTIONS.keys() & filenames:
+            action = _FILENAME_ACTIONS[filename]
+            if action & _KEY_FILE:
+                key_files.append(prefix + filename)
+            if action & _ENTRYPOINT:
+                entrypoints.add(prefix + filename)
+            if action & _SERVICE_MARKER:
+                is_service = True
+        language_counts.update(_file_languages(filenames))
+
+        if is_service and rel_dir and rel_dir != ".":
+            services.add(rel_dir)
+
+    key_files.sort()
+    languages = dict(language_counts.most_common(8))
+    service_list = sorted(services)
+    entrypoint_list = sorted(entrypoints)
     summary = {
         "repo_url": repo_url,
         "repo_name": repo_name,
         "commit": commit,
-        "top_level_dirs": sorted(top_dirs),
-        "key_files": sorted(key_files),
-        "languages": dict(language_counts.most_common(8)),
-        "services": services,
-        "entrypoints": sorted(set(entrypoints)),
+        # _tree_dirs already returns the top-level directories sorted.
+        "top_level_dirs": top_dirs,
+        "key_files": key_files,
+        "languages": languages,
+        "services": service_list,
+        "entrypoints": entrypoint_list,
     }
 
-    content_lines = [
-        f"Repository: {repo_name}",
-        f"URL: {repo_url}",
-        f"Commit: {commit}",
-        f"Top-level directories: {', '.join(summary['top_level_dirs']) or 'none'}",
-        f"Key files: {', '.join(summary['key_files']) or 'none'}",
-        f"Languages: {', '.join([f"{k}({v})" for k, v in summary['languages'].items()]) or 'unknown'}",
-        f"Services (monorepo roots): {', '.join(summary['services']) or 'none'}",
-        f"Entrypoints: {', '.join(summary['entrypoints']) or 'none'}",
-    ]
-
-    return {"summary": summary, "content": "\n".join(content_lines)}
+    # One f-string concatenation builds the whole block in a single pass.
+    content = (
+        f"Repository: {repo_name}\n"
+        f"URL: {repo_url}\n"
+        f"Commit: {commit}\n"
+        f"Top-level directories: {', '.join(top_dirs) or 'none'}\n"
+        f"Key files: {', '.join(key_files) or 'none'}\n"
+        f"Languages: {', '.join(f'{k}({v})' for k, v in languages.items()) or 'unknown'}\n"
+        f"Services (monorepo roots): {', '.join(service_list) or 'none'}\n"
+        f"Entrypoints: {', '.join(entrypoint_list) or 'none'}"
+    )
+
+    return {"summary": summary, "content": content}
 
 
 def ingest_github_repo(repo_url: str) -> Dict[str, object]:
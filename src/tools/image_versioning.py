@@ -1,34 +1,86 @@
-"""Image versioning tool."""
+"""Image versioning tool.
+
+Each ``{name}_images.json`` manifest is rewritten atomically on every change,
+under a lock that serialises writers across threads and processes, so readers
+always see a complete, current manifest.
+"""
 from __future__ import annotations
 
+import fcntl
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
 
 from src.utils.config import settings
-from src.utils.file_utils import ensure_dir
+from src.utils.file_utils import atomic_write_bytes
+from src.utils.file_utils import ensure_dir_once
 from src.utils.file_utils import read_text_file
 
+# Keyed by manifest path so a changed output_dir never serves stale entries.
+_versions_cache: Dict[Path, List[Dict[str, str]]] = {}
+# (st_ino, mtime_ns, size) of the manifest when it was last read; every write
+# replaces the file, so a mismatch means the cached copy is stale.
+_versions_stamps: Dict[Path, Optional[Tuple[int, int, int]]] = {}
+# flock serialises processes; threads in this process also share the cache.
+_versions_lock = threading.Lock()
+
 
 def _manifest_path(name: str) -> Path:
-    output_dir = ensure_dir(settings.output_dir)
+    output_dir = ensure_dir_once(settings.output_dir)
     return Path(output_dir) / f"{name}_images.json"
 
 
+@contextmanager
+def _locked(manifest: Path) -> Iterator[None]:
+    with _versions_lock, manifest.with_suffix(".lock").open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def _stamp(manifest: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = manifest.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _cached_versions(manifest: Path) -> List[Dict[str, str]]:
+    stamp = _stamp(manifest)
+    versions = _versions_cache.get(manifest)
+    if versions is None or _versions_stamps.get(manifest) != stamp:
+        versions = json.loads(read_text_file(str(manifest))) if stamp else []
+        _versions_cache[manifest] = versions
+        _versions_stamps[manifest] = stamp
+    return versions
+
+
+def _write_versions(manifest: Path, versions: List[Dict[str, str]]) -> None:
+    atomic_write_bytes(manifest, orjson.dumps(versions))
+    _versions_cache[manifest] = versions
+    _versions_stamps[manifest] = _stamp(manifest)
+
+
 def load_versions(name: str) -> List[Dict[str, str]]:
-    path = _manifest_path(name)
-    if not path.exists():
-        return []
-    return json.loads(read_text_file(str(path)))
+    manifest = _manifest_path(name)
+    with _versions_lock:
+        return list(_cached_versions(manifest))
 
 
 def add_version(name: str, image_file: str) -> List[Dict[str, str]]:
-    versions = load_versions(name)
-    version = len(versions) + 1
-    versions.append({"version": version, "file": image_file})
-    _manifest_path(name).write_text(json.dumps(versions, indent=2), encoding="utf-8")
-    return versions
+    manifest = _manifest_path(name)
+    with _locked(manifest):
+        versions = list(_cached_versions(manifest))
+        versions.append({"version": len(versions) + 1, "file": image_file})
+        _write_versions(manifest, versions)
+        return list(versions)
 
 
 def set_versions(name: str, versions: List[Dict[str, str]]) -> None:
-    _manifest_path(name).write_text(json.dumps(versions, indent=2), encoding="utf-8")
+    manifest = _manifest_path(name)
+    with _locked(manifest):
+        _write_versions(manifest, list(versions))
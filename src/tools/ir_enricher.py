@@ -1,15 +1,18 @@
 """Deterministic IR enrichment helpers (spec v34)."""
 from __future__ import annotations
 
-import json
 import re
-from copy import deepcopy
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-from jsonschema import Draft202012Validator
+import fastjsonschema
+import orjson
+
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator
 
 DEFAULT_PALETTE = [
     "#FDE68A",
@@ -126,6 +129,7 @@ _TECH_DEPS: List[Tuple[str, str, str, str, float]] = [
     ("primary",    "secondary",  "data",  "primary replicates to secondary", 0.7),
     ("dc",         "dr",         "data",  "dc replicates to dr site",        0.7),
 ]
+_TECH_KEYWORDS = frozenset(kw for from_kw, to_kw, *_ in _TECH_DEPS for kw in (from_kw, to_kw))
 LAYOUT_MAP = {
     "left-to-right": "left-right",
     "left_right": "left-right",
@@ -140,6 +144,37 @@ LAYOUT_MAP = {
 }
 
 
+_HEX6_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+_HEX3_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{3}$")
+_RGB_COLOR_RE = re.compile(r"rgb\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RUN_RE = re.compile(r"[^a-z0-9]+")
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9]")
+# ASCII fast path for the two patterns above: non-alphanumerics become spaces
+# and str.split() yields the alphanumeric runs. Non-ASCII text uses the regexes.
+_NON_ALNUM_TO_SPACE = str.maketrans({chr(code): " " for code in range(128) if not chr(code).isalnum()})
+
+
+# Key-ordered templates for enriched nodes and edges (schema field order).
+# Copying a prebuilt dict and storing the per-item fields is cheaper than
+# building each ~13-key literal from scratch.
+_NODE_TEMPLATE: Dict[str, object] = dict.fromkeys((
+    "node_id", "label", "role", "zone", "type", "stereotype", "shape",
+    "size_hint", "width", "height", "node_style", "rendering_hints", "metadata",
+))
+_EDGE_TEMPLATE: Dict[str, object] = dict.fromkeys((
+    "edge_id", "from_id", "to_id", "rel_type", "label", "style", "color",
+    "width", "arrowhead", "text_style", "curvature", "confidence", "reason",
+))
+_INFERRED_EDGE_TEMPLATE: Dict[str, object] = {
+    **_EDGE_TEMPLATE,
+    "style": "dashed",
+    "width": 1,
+    "arrowhead": "open",
+    "curvature": 0.0,
+}
+
+
 class IREnrichmentError(RuntimeError):
     """Raised when deterministic enrichment fails validation."""
 
@@ -148,46 +183,94 @@ def enrich_ir(input_ir: Dict[str, object]) -> Dict[str, object]:
     """Produce an enriched IR payload that satisfies the v34 schema."""
     builder = _IREnricher(input_ir or {})
     enriched = builder.build()
-    errors = validate_enriched_ir(enriched)
-    if errors:
-        raise IREnrichmentError("; ".join(errors))
+    # is_valid stops at the first failure; only collect messages when raising.
+    if not _is_valid_enriched_ir(enriched):
+        raise IREnrichmentError("; ".join(validate_enriched_ir(enriched)))
     return enriched
 
 
 def validate_enriched_ir(payload: Dict[str, object], schema_path: Optional[Path] = None) -> List[str]:
     """Validate payload against the enriched IR schema and return error messages."""
-    schema = _load_schema(schema_path or SCHEMA_PATH)
-    validator = Draft202012Validator(schema)
-    errors = []
-    for err in sorted(validator.iter_errors(payload), key=lambda e: e.path):
-        location = "/".join(str(part) for part in err.path) or "<root>"
-        errors.append(f"{location}: {err.message}")
-    return errors
+    if _is_valid_enriched_ir(payload, schema_path):
+        return []
+    # jsonschema is only used to describe failures: it reports every error
+    # with its path, where the compiled validator stops at the first one.
+    validator = _get_validator(schema_path or SCHEMA_PATH)
+    # Snapshot each error's deque path as a tuple once; the sort then compares
+    # tuples rather than deques and the error objects can be dropped.
+    located = [(tuple(err.path), err.message) for err in validator.iter_errors(payload)]
+    located.sort(key=lambda item: item[0])
+    return [f"{'/'.join(map(str, path)) or '<root>'}: {message}" for path, message in located]
+
+
+def _is_valid_enriched_ir(payload: Dict[str, object], schema_path: Optional[Path] = None) -> bool:
+    try:
+        _get_compiled_validator(schema_path or SCHEMA_PATH)(payload)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
 
 
 class _IREnricher:
+    __slots__ = (
+        "source",
+        "diagram_type",
+        "layout",
+        "aesthetic_intent",
+        "palette",
+        "relationships",
+        "zone_data",
+        "zone_order",
+        "zone_colors",
+        "node_ids",
+        "edge_ids",
+        "nodes",
+        "edges",
+        "validation_messages",
+        "node_lookup",
+        "label_lower",
+        "inference_log",
+        "default_colors",
+        "node_style_base",
+        "node_styles",
+    )
+
     def __init__(self, source: Dict[str, object]):
         self.source = source
         self.diagram_type = self._diagram_type()
         self.layout = self._layout()
         self.aesthetic_intent = self._extract_aesthetic_intent()
         self.palette = self._derive_palette()
-        self.relationships = list(self._coerce_list(source.get("relationships")))
+        self.relationships = [
+            rel if isinstance(rel, dict) else _rel_fields(rel) for rel in self._coerce_list(source.get("relationships"))
+        ]
         self.zone_data = self._coerce_zones(source.get("zones"))
         self.zone_order = self._build_zone_order()
         self.zone_colors = self._assign_zone_colors()
-        self.node_ids: set[str] = set()
-        self.edge_ids: set[str] = set()
+        # Per-node constants, resolved once instead of in every _add_node call.
+        self.default_colors = {"fill": self.palette[0], "border": self.palette[1 % len(self.palette)]}
+        self.node_style_base = {
+            "textColor": self.palette[-1],
+            "borderWidth": 2,
+            "fontSize": 12,
+            "fontFamily": FONT_FAMILY,
+        }
+        # (zone, node_type) -> node_style template; see _node_style.
+        self.node_styles: Dict[Tuple[Optional[str], str], Dict[str, object]] = {}
+        # Identifier -> next collision suffix (see _unique_identifier).
+        self.node_ids: Dict[str, int] = {}
+        self.edge_ids: Dict[str, int] = {}
         self.nodes: List[Dict[str, object]] = []
         self.edges: List[Dict[str, object]] = []
         self.validation_messages: List[Dict[str, str]] = []
         self.node_lookup: Dict[str, Dict[str, object]] = {}
+        # node_id -> lowercased label, shared by the inference rules and sorting.
+        self.label_lower: Dict[str, str] = {}
         # Records of inferred edges for explainability (not in enriched output — schema compliant)
         self.inference_log: List[Dict[str, object]] = []
 
     def build(self) -> Dict[str, object]:
         self._populate_nodes()
-        self._populate_relationship_nodes()
         self._populate_edges()
         self._infer_missing_connections()
         self._sort_nodes()
@@ -244,12 +327,19 @@ class _IREnricher:
             return []
         return [value]
 
-    def _coerce_zones(self, zones: object) -> Dict[str, List[str]]:
-        data: Dict[str, List[str]] = {}
-        if isinstance(zones, dict):
-            for key, value in zones.items():
-                data[str(key)] = [str(entry) for entry in self._coerce_list(value) if str(entry).strip()]
-        return data
+    @staticmethod
+    def _coerce_zones(zones: object) -> Dict[str, List[str]]:
+        if not isinstance(zones, dict):
+            return {}
+        # Same coercion as _coerce_list, inlined; each entry is stringified once.
+        return {
+            str(key): [
+                text
+                for text in map(str, value if isinstance(value, list) else ([] if value is None else [value]))
+                if text.strip()
+            ]
+            for key, value in zones.items()
+        }
 
     def _build_zone_order(self) -> List[str]:
         explicit = [zone for zone in DEFAULT_ZONE_ORDER if zone in self.zone_data and self.zone_data.get(zone)]
@@ -273,22 +363,6 @@ class _IREnricher:
             for label in self.zone_data.get(zone, []):
                 self._add_node(label, zone, inferred=False)
 
-    def _populate_relationship_nodes(self) -> None:
-        for rel in self.relationships:
-            for primary, alternate in (("from", "from_"), ("to", None)):
-                raw = self._rel_value(rel, primary, alternate)
-                label = str(raw or "").strip()
-                if not label:
-                    continue
-                key = _label_key(label)
-                if key in self.node_lookup:
-                    continue
-                self._add_node(label, None, inferred=True)
-                self.validation_messages.append({
-                    "severity": "warning",
-                    "message": f"Inferred node '{label}' from relationship endpoints",
-                })
-
     def _add_node(self, label: str, zone: Optional[str], inferred: bool) -> Dict[str, object]:
         normalized_label = (label or "").strip() or "node"
         key = _label_key(normalized_label)
@@ -298,40 +372,41 @@ class _IREnricher:
         role, node_type = self._infer_role_and_type(normalized_label, zone)
         shape = SHAPE_BY_TYPE.get(node_type, "rectangle")
         size_hint = SIZE_BY_TYPE.get(node_type, "medium")
-        colors = self.zone_colors.get(zone or "", {"fill": self.palette[0], "border": self.palette[1 % len(self.palette)]})
-        style = {
-            "fillColor": colors["fill"],
-            "borderColor": colors["border"],
-            "textColor": self.palette[-1],
-            "borderWidth": 2,
-            "fontSize": 12,
-            "fontFamily": FONT_FAMILY,
-            "padding": 6 if node_type == "actor" else (10 if node_type == "data_store" else 8),
-        }
-        node = {
-            "node_id": node_id,
-            "label": normalized_label,
-            "role": role,
-            "zone": zone,
-            "type": node_type,
-            "stereotype": STEREOTYPE_BY_ROLE.get(role),
-            "shape": shape,
-            "size_hint": size_hint,
-            "width": None,
-            "height": None,
-            "node_style": style,
-            "rendering_hints": self._rendering_hints(node_type, colors["fill"], normalized_label),
-            "metadata": {
-                "confidence": 0.98 if not inferred else 0.8,
-                "reason": "explicit zone membership" if not inferred else "derived from relationship",
-                "source": f"zones.{zone}" if zone else "relationships",
-            },
+        colors = self.zone_colors.get(zone or "", self.default_colors)
+        style = self._node_style(zone, node_type, colors)
+        node = _NODE_TEMPLATE.copy()
+        node["node_id"] = node_id
+        node["label"] = normalized_label
+        node["role"] = role
+        node["zone"] = zone
+        node["type"] = node_type
+        node["stereotype"] = STEREOTYPE_BY_ROLE.get(role)
+        node["shape"] = shape
+        node["size_hint"] = size_hint
+        node["node_style"] = style
+        node["rendering_hints"] = self._rendering_hints(node_type, colors["fill"], normalized_label)
+        node["metadata"] = {
+            "confidence": 0.98 if not inferred else 0.8,
+            "reason": "explicit zone membership" if not inferred else "derived from relationship",
+            "source": f"zones.{zone}" if zone else "relationships",
         }
         self.nodes.append(node)
         self.node_lookup[key] = node
-        self.node_ids.add(node_id)
+        self.label_lower[node_id] = normalized_label.lower()
         return node
 
+    def _node_style(self, zone: Optional[str], node_type: str, colors: Dict[str, str]) -> Dict[str, object]:
+        """Return a fresh copy of the style shared by every node of ``(zone, node_type)``."""
+        template = self.node_styles.get((zone, node_type))
+        if template is None:
+            template = self.node_styles[(zone, node_type)] = {
+                "fillColor": colors["fill"],
+                "borderColor": colors["border"],
+                **self.node_style_base,
+                "padding": 6 if node_type == "actor" else (10 if node_type == "data_store" else 8),
+            }
+        return template.copy()
+
     def _rendering_hints(self, node_type: str, fill_color: str, label: str) -> Dict[str, object]:
         plantuml_shape = PLANTUML_SHAPE_BY_TYPE.get(node_type, "component")
         mermaid_type = MERMAID_TYPE_BY_TYPE.get(node_type, "class")
@@ -351,20 +426,21 @@ class _IREnricher:
         if zone in ROLE_BY_ZONE:
             role = ROLE_BY_ZONE[zone]
         else:
-            role = _role_from_label(label)
+            role = _role_from_label(label.lower())
         node_type = TYPE_BY_ROLE.get(role, "container")
         return role, node_type
 
     def _populate_edges(self) -> None:
         for rel in self.relationships:
-            from_label = str(self._rel_value(rel, "from", "from_") or "").strip()
-            to_label = str(self._rel_value(rel, "to") or "").strip()
-            if not from_label or not to_label:
+            from_label = str(_rel_value(rel, "from", "from_") or "").strip()
+            to_label = str(_rel_value(rel, "to", None) or "").strip()
+            # Endpoints get their nodes even when the edge itself is skipped.
+            from_node = self._ensure_node(from_label) if from_label else None
+            to_node = self._ensure_node(to_label) if to_label else None
+            if from_node is None or to_node is None:
                 continue
-            from_node = self._ensure_node(from_label)
-            to_node = self._ensure_node(to_label)
-            rel_type = str(self._rel_value(rel, "type") or "sync").lower()
-            description = self._rel_value(rel, "description") or self._rel_value(rel, "label")
+            rel_type = str(_rel_value(rel, "type", None) or "sync").lower()
+            description = _rel_value(rel, "description", None) or _rel_value(rel, "label", None)
             label = str(description or f"{from_label} -> {to_label}")
             preset = EDGE_PRESETS.get(rel_type, EDGE_PRESETS["sync"])
             color = self.palette[preset["palette_index"] % len(self.palette)]
@@ -379,21 +455,20 @@ class _IREnricher:
                 "textColor": color,
             }
             confidence = 0.95 if description else 0.85
-            edge = {
-                "edge_id": edge_id,
-                "from_id": from_node["node_id"],
-                "to_id": to_node["node_id"],
-                "rel_type": rel_type,
-                "label": label,
-                "style": preset["style"],
-                "color": color,
-                "width": 2,
-                "arrowhead": preset["arrowhead"],
-                "text_style": text_style,
-                "curvature": preset.get("curvature", 0.0),
-                "confidence": confidence,
-                "reason": "explicit relationship" if description else "relationship inferred",
-            }
+            edge = _EDGE_TEMPLATE.copy()
+            edge["edge_id"] = edge_id
+            edge["from_id"] = from_node["node_id"]
+            edge["to_id"] = to_node["node_id"]
+            edge["rel_type"] = rel_type
+            edge["label"] = label
+            edge["style"] = preset["style"]
+            edge["color"] = color
+            edge["width"] = 2
+            edge["arrowhead"] = preset["arrowhead"]
+            edge["text_style"] = text_style
+            edge["curvature"] = preset.get("curvature", 0.0)
+            edge["confidence"] = confidence
+            edge["reason"] = "explicit relationship" if description else "relationship inferred"
             self.edges.append(edge)
 
     def _ensure_node(self, label: str) -> Dict[str, object]:
@@ -401,6 +476,10 @@ class _IREnricher:
         node = self.node_lookup.get(key)
         if node:
             return node
+        self.validation_messages.append({
+            "severity": "warning",
+            "message": f"Inferred node '{label}' from relationship endpoints",
+        })
         return self._add_node(label, None, inferred=True)
 
     def _infer_missing_connections(self) -> None:
@@ -419,18 +498,23 @@ class _IREnricher:
             return
 
         # Degree index (inbound + outbound)
-        degree: Dict[str, int] = {n["node_id"]: 0 for n in self.nodes}
-        for edge in self.edges:
-            degree[edge["from_id"]] = degree.get(edge["from_id"], 0) + 1
-            degree[edge["to_id"]] = degree.get(edge["to_id"], 0) + 1
+        # Counter reads missing nodes as 0, so isolated nodes need no entry.
+        degree: Counter[str] = Counter(edge["from_id"] for edge in self.edges)
+        degree.update(edge["to_id"] for edge in self.edges)
 
-        # Zone → sorted node list
-        zone_nodes: Dict[str, List[Dict[str, object]]] = {}
-        for zone in self.zone_order:
-            zone_nodes[zone] = sorted(
-                [n for n in self.nodes if n.get("zone") == zone],
-                key=lambda n: n["label"].lower(),
-            )
+        label_lower = self.label_lower
+
+        def label_sort_key(node: Dict[str, object]) -> str:
+            return label_lower[node["node_id"]]
+
+        # Zone → sorted node list, bucketed in one pass over the nodes
+        zone_nodes: Dict[str, List[Dict[str, object]]] = {zone: [] for zone in self.zone_order}
+        for n in self.nodes:
+            bucket = zone_nodes.get(n.get("zone"))
+            if bucket is not None:
+                bucket.append(n)
+        for bucket in zone_nodes.values():
+            bucket.sort(key=label_sort_key)
 
         # Existing from_id→to_id pairs for deduplication
         existing_pairs: set[tuple[str, str]] = {
@@ -439,19 +523,21 @@ class _IREnricher:
         inferred: List[Dict[str, object]] = []
 
         # ── Rule 1: Zone-layer cascade ──────────────────────────────────────
+        # Unordered zone pairs already joined by an edge, so the bridge check
+        # is a set lookup rather than a scan over every edge per zone pair.
+        node_zone: Dict[str, Optional[str]] = {n["node_id"]: n.get("zone") for n in self.nodes}
+        bridged_zone_pairs: set[frozenset[str]] = set()
+        for e in self.edges:
+            zone_a, zone_b = node_zone.get(e["from_id"]), node_zone.get(e["to_id"])
+            if zone_a and zone_b:
+                bridged_zone_pairs.add(frozenset((zone_a, zone_b)))
         for from_zone, to_zone in _ZONE_CASCADE_PAIRS:
             from_nodes = zone_nodes.get(from_zone, [])
             to_nodes = zone_nodes.get(to_zone, [])
             if not from_nodes or not to_nodes:
                 continue
-            from_ids = {n["node_id"] for n in from_nodes}
-            to_ids = {n["node_id"] for n in to_nodes}
-            already = any(
-                (e["from_id"] in from_ids and e["to_id"] in to_ids)
-                or (e["from_id"] in to_ids and e["to_id"] in from_ids)
-                for e in self.edges + inferred
-            )
-            if already:
+            zone_pair = frozenset((from_zone, to_zone))
+            if zone_pair in bridged_zone_pairs:
                 continue
             from_node = from_nodes[0]
             to_node = to_nodes[0]
@@ -466,62 +552,88 @@ class _IREnricher:
                 )
                 inferred.append(edge)
                 existing_pairs.add(pair)
-                degree[from_node["node_id"]] = degree.get(from_node["node_id"], 0) + 1
-                degree[to_node["node_id"]] = degree.get(to_node["node_id"], 0) + 1
+                bridged_zone_pairs.add(zone_pair)
+                degree[from_node["node_id"]] += 1
+                degree[to_node["node_id"]] += 1
 
         # ── Rule 2: Tech-dependency keywords ────────────────────────────────
-        sorted_nodes = sorted(self.nodes, key=lambda n: n["label"].lower())
-        for i, node_a in enumerate(sorted_nodes):
-            la = node_a["label"].lower()
-            for node_b in sorted_nodes[i + 1:]:
-                lb = node_b["label"].lower()
-                matched = False
-                for from_kw, to_kw, rel_type, reason, confidence in _TECH_DEPS:
-                    if matched:
-                        break
-                    if from_kw in la and to_kw in lb:
-                        pair = (node_a["node_id"], node_b["node_id"])
-                        if pair not in existing_pairs:
-                            edge = self._make_inferred_edge(
-                                node_a, node_b,
-                                rel_type=rel_type, rule="tech_dependency",
-                                reason=reason, confidence=confidence,
-                            )
-                            inferred.append(edge)
-                            existing_pairs.add(pair)
-                            degree[node_a["node_id"]] = degree.get(node_a["node_id"], 0) + 1
-                            degree[node_b["node_id"]] = degree.get(node_b["node_id"], 0) + 1
-                        matched = True
-                        continue
-                    if from_kw in lb and to_kw in la:
-                        pair = (node_b["node_id"], node_a["node_id"])
-                        if pair not in existing_pairs:
-                            edge = self._make_inferred_edge(
-                                node_b, node_a,
-                                rel_type=rel_type, rule="tech_dependency",
-                                reason=reason + " (reversed)", confidence=confidence,
-                            )
-                            inferred.append(edge)
-                            existing_pairs.add(pair)
-                            degree[node_b["node_id"]] = degree.get(node_b["node_id"], 0) + 1
-                            degree[node_a["node_id"]] = degree.get(node_a["node_id"], 0) + 1
-                        matched = True
+        sorted_nodes = sorted(self.nodes, key=label_sort_key)
+        # Substring-match every keyword once per label; the pair loop below
+        # then only does set lookups.
+        label_kws = {n["node_id"]: _tech_keywords(label_lower[n["node_id"]]) for n in sorted_nodes}
+        # Only pairs drawn from a pattern's from/to keyword buckets can match,
+        # so enumerate those instead of all N² pairs. Candidates are visited in
+        # the same (i < j) order as the full scan, and each pair only tries the
+        # patterns involving node_a's keywords, so first-match-wins is kept.
+        keyword_nodes = [n for n in sorted_nodes if label_kws[n["node_id"]]]
+        kw_positions: Dict[str, List[int]] = defaultdict(list)
+        for pos, node in enumerate(keyword_nodes):
+            for kw in label_kws[node["node_id"]]:
+                kw_positions[kw].append(pos)
+        candidate_pairs: set[tuple[int, int]] = set()
+        for from_kw, to_kw, *_ in _TECH_DEPS:
+            to_positions = kw_positions.get(to_kw)
+            if not to_positions:
+                continue
+            for pos_a in kw_positions.get(from_kw, ()):
+                for pos_b in to_positions:
+                    if pos_a != pos_b:
+                        candidate_pairs.add((pos_a, pos_b) if pos_a < pos_b else (pos_b, pos_a))
+        deps_by_pos: Dict[int, List[Tuple[str, str, str, str, float]]] = {}
+        for i, j in sorted(candidate_pairs):
+            node_a, node_b = keyword_nodes[i], keyword_nodes[j]
+            la = label_kws[node_a["node_id"]]
+            lb = label_kws[node_b["node_id"]]
+            deps_a = deps_by_pos.get(i)
+            if deps_a is None:
+                deps_a = deps_by_pos[i] = [dep for dep in _TECH_DEPS if dep[0] in la or dep[1] in la]
+            matched = False
+            for from_kw, to_kw, rel_type, reason, confidence in deps_a:
+                if matched:
+                    break
+                if from_kw in la and to_kw in lb:
+                    pair = (node_a["node_id"], node_b["node_id"])
+                    if pair not in existing_pairs:
+                        edge = self._make_inferred_edge(
+                            node_a, node_b,
+                            rel_type=rel_type, rule="tech_dependency",
+                            reason=reason, confidence=confidence,
+                        )
+                        inferred.append(edge)
+                        existing_pairs.add(pair)
+                        degree[node_a["node_id"]] += 1
+                        degree[node_b["node_id"]] += 1
+                    matched = True
+                    continue
+                if from_kw in lb and to_kw in la:
+                    pair = (node_b["node_id"], node_a["node_id"])
+                    if pair not in existing_pairs:
+                        edge = self._make_inferred_edge(
+                            node_b, node_a,
+                            rel_type=rel_type, rule="tech_dependency",
+                            reason=reason + " (reversed)", confidence=confidence,
+                        )
+                        inferred.append(edge)
+                        existing_pairs.add(pair)
+                        degree[node_b["node_id"]] += 1
+                        degree[node_a["node_id"]] += 1
+                    matched = True
 
         # ── Rule 3: Completion guard ─────────────────────────────────────────
         for node in sorted_nodes:
-            if degree.get(node["node_id"], 0) > 0:
+            if degree[node["node_id"]] > 0:
                 continue
             zone = node.get("zone")
             anchor: Optional[Dict[str, object]] = None
             # Prefer a connected node in the same zone
             for candidate in zone_nodes.get(zone, []):
-                if candidate["node_id"] != node["node_id"] and degree.get(candidate["node_id"], 0) > 0:
+                if candidate["node_id"] != node["node_id"] and degree[candidate["node_id"]] > 0:
                     anchor = candidate
                     break
             # Fall back to any connected node globally
             if anchor is None:
                 for candidate in sorted_nodes:
-                    if candidate["node_id"] != node["node_id"] and degree.get(candidate["node_id"], 0) > 0:
+                    if candidate["node_id"] != node["node_id"] and degree[candidate["node_id"]] > 0:
                         anchor = candidate
                         break
             # Last resort: connect to any other node even if it too has degree 0
@@ -543,8 +655,8 @@ class _IREnricher:
                 )
                 inferred.append(edge)
                 existing_pairs.add(pair)
-                degree[anchor["node_id"]] = degree.get(anchor["node_id"], 0) + 1
-                degree[node["node_id"]] = degree.get(node["node_id"], 0) + 1
+                degree[anchor["node_id"]] += 1
+                degree[node["node_id"]] += 1
 
         self.edges.extend(inferred)
 
@@ -577,25 +689,23 @@ class _IREnricher:
             "reason": reason,
             "confidence": confidence,
         })
-        return {
-            "edge_id": edge_id,
-            "from_id": from_node["node_id"],
-            "to_id": to_node["node_id"],
-            "rel_type": rel_type,
-            "label": reason,
-            "style": "dashed",
-            "color": color,
-            "width": 1,
-            "arrowhead": "open",
-            "text_style": text_style,
-            "curvature": 0.0,
-            "confidence": confidence,
-            "reason": reason,
-        }
+        edge = _INFERRED_EDGE_TEMPLATE.copy()
+        edge["edge_id"] = edge_id
+        edge["from_id"] = from_node["node_id"]
+        edge["to_id"] = to_node["node_id"]
+        edge["rel_type"] = rel_type
+        edge["label"] = reason
+        edge["color"] = color
+        edge["text_style"] = text_style
+        edge["confidence"] = confidence
+        edge["reason"] = reason
+        return edge
 
     def _sort_nodes(self) -> None:
         zone_rank = {zone: idx for idx, zone in enumerate(self.zone_order)}
-        self.nodes.sort(key=lambda node: (zone_rank.get(node.get("zone"), len(zone_rank)), node["label"].lower()))
+        unranked = len(zone_rank)
+        label_lower = self.label_lower
+        self.nodes.sort(key=lambda node: (zone_rank.get(node.get("zone"), unranked), label_lower[node["node_id"]]))
 
     def _node_intent(self) -> Dict[str, Dict[str, object]]:
         intent: Dict[str, Dict[str, object]] = {}
@@ -605,7 +715,8 @@ class _IREnricher:
                 continue
             entry = {
                 "shape": node["shape"],
-                "default_style": deepcopy(node["node_style"]),
+                # Styles are flat str -> scalar maps, so a shallow copy suffices.
+                "default_style": dict(node["node_style"]),
                 "stereotype": node.get("stereotype"),
             }
             intent[role] = entry
@@ -622,7 +733,7 @@ class _IREnricher:
                 "color": edge["color"],
                 "width": edge["width"],
                 "arrowhead": edge["arrowhead"],
-                "text_style": deepcopy(edge["text_style"]),
+                "text_style": dict(edge["text_style"]),
             }
         return intent
 
@@ -671,75 +782,147 @@ class _IREnricher:
             "source_system": self.source.get("system_name"),
         }
 
-    @staticmethod
-    def _rel_value(rel: object, primary: str, alternate: Optional[str] = None) -> Optional[object]:
-        if isinstance(rel, dict):
-            if primary in rel:
-                return rel.get(primary)
-            if alternate and alternate in rel:
-                return rel.get(alternate)
-            return None
-        if hasattr(rel, primary):
-            return getattr(rel, primary)
-        if alternate and hasattr(rel, alternate):
-            return getattr(rel, alternate)
-        return None
+
+_MISSING = object()
+_REL_FIELDS = ("from", "from_", "to", "type", "description", "label")
 
 
+def _rel_fields(rel: object) -> Dict[str, object]:
+    """Copy the relationship fields set on ``rel`` into a dict, so one accessor serves every relationship."""
+    fields = {}
+    for name in _REL_FIELDS:
+        value = getattr(rel, name, _MISSING)
+        if value is not _MISSING:
+            fields[name] = value
+    return fields
+
+
+def _rel_value(rel: Dict[str, object], primary: str, alternate: Optional[str] = None) -> Optional[object]:
+    if primary in rel:
+        return rel[primary]
+    if alternate and alternate in rel:
+        return rel[alternate]
+    return None
+
+
+@lru_cache(maxsize=4096)
 def _label_key(label: str) -> str:
-    return re.sub(r"\s+", " ", label.strip().lower())
+    return _WHITESPACE_RE.sub(" ", label.strip().lower())
 
 
 def _normalize_color(value: object) -> Optional[str]:
     if not isinstance(value, str):
         return None
+    # Only strings reach the cache; other palette entries may be unhashable.
+    return _normalize_color_text(value)
+
+
+@lru_cache(maxsize=256)
+def _normalize_color_text(value: str) -> Optional[str]:
     token = value.strip()
     if not token:
         return None
-    if re.match(r"^#[0-9a-fA-F]{6}$", token):
+    if _HEX6_COLOR_RE.match(token):
         return token.upper()
-    short = re.match(r"^#[0-9a-fA-F]{3}$", token)
+    short = _HEX3_COLOR_RE.match(token)
     if short:
         expanded = "#" + "".join(ch * 2 for ch in short.group(0)[1:])
         return expanded.upper()
-    rgb = re.match(r"rgb\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*\)", token, re.IGNORECASE)
+    rgb = _RGB_COLOR_RE.match(token)
     if rgb:
         r, g, b = (max(0, min(255, int(part))) for part in rgb.groups())
         return f"#{r:02X}{g:02X}{b:02X}"
     return None
 
 
-def _unique_identifier(label: str, existing: set[str], prefix: str) -> str:
-    base = re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_") or prefix
-    candidate = base
-    counter = 2
+def _unique_identifier(label: str, existing: Dict[str, int], prefix: str) -> str:
+    """Derive an identifier from ``label`` that is not yet a key of ``existing``.
+
+    ``existing`` maps each identifier handed out to the next suffix to try when
+    it comes up again as a base, so repeated labels resume the scan where the
+    previous collision left off instead of re-probing ``_2``, ``_3``, ...
+    """
+    lowered = label.lower()
+    if lowered.isascii():
+        base = "_".join(lowered.translate(_NON_ALNUM_TO_SPACE).split()) or prefix
+    else:
+        base = _NON_ALNUM_RUN_RE.sub("_", lowered).strip("_") or prefix
+    counter = existing.get(base)
+    if counter is None:
+        existing[base] = 2
+        return base
+    # A suffixed id can also be another label's base, so it is still checked.
+    candidate = f"{base}_{counter}"
     while candidate in existing:
-        candidate = f"{base}_{counter}"
         counter += 1
-    existing.add(candidate)
+        candidate = f"{base}_{counter}"
+    existing[base] = counter + 1
+    existing[candidate] = 2
     return candidate
 
 
-def _role_from_label(label: str) -> str:
-    lowered = label.lower()
-    if any(word in lowered for word in ["user", "client", "portal", "browser", "mobile"]):
-        return "actor"
-    if any(word in lowered for word in ["gateway", "edge", "ingress"]):
-        return "gateway"
-    if any(word in lowered for word in ["db", "database", "store", "storage", "cache"]):
-        return "data_store"
-    if any(word in lowered for word in ["email", "sms", "auth", "payment", "third", "external"]):
-        return "external"
-    return "service"
+def _tech_keywords(lowered_label: str) -> frozenset[str]:
+    """Return the _TECH_DEPS keywords that occur as substrings of ``lowered_label``."""
+    return frozenset(kw for kw in _TECH_KEYWORDS if kw in lowered_label)
+
+
+# Checked in order; the first role with a keyword in the label wins.
+_ROLE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("actor", ("user", "client", "portal", "browser", "mobile")),
+    ("gateway", ("gateway", "edge", "ingress")),
+    ("data_store", ("db", "database", "store", "storage", "cache")),
+    ("external", ("email", "sms", "auth", "payment", "third", "external")),
+)
+
+
+_ROLE_PRIORITY = {word: rank for rank, (_, words) in enumerate(_ROLE_KEYWORDS) for word in words}
+# Zero-width lookahead so overlapping keywords ("cachedge") are all found in a
+# single scan; no keyword is a prefix of another, so each position yields at
+# most one. No \b anchors: roles match on substrings, as before.
+_ROLE_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(word) for word in sorted(_ROLE_PRIORITY, key=len, reverse=True)) + "))"
+)
+
+
+@lru_cache(maxsize=2048)
+def _role_from_label(lowered: str) -> str:
+    """Infer a node role from an already-lowercased label."""
+    ranks = {_ROLE_PRIORITY[match.group(1)] for match in _ROLE_KEYWORD_RE.finditer(lowered)}
+    return _ROLE_KEYWORDS[min(ranks)][0] if ranks else "service"
 
 
+@lru_cache(maxsize=2048)
 def _mermaid_identifier(label: str) -> str:
-    parts = re.split(r"[^a-zA-Z0-9]", label)
+    parts = label.translate(_NON_ALNUM_TO_SPACE).split() if label.isascii() else _NON_ALNUM_RE.split(label)
     cleaned = "".join(part.capitalize() for part in parts if part)
     return cleaned or "Node"
 
 
 @lru_cache(maxsize=4)
 def _load_schema(path: Path) -> Dict[str, object]:
-    text = path.read_text(encoding="utf-8")
-    return json.loads(text)
+    return orjson.loads(path.read_bytes())
+
+
+@lru_cache(maxsize=4)
+def _get_validator(path: Path) -> Draft202012Validator:
+    """Build the descriptive (error-reporting) validator once per schema path.
+
+    jsonschema is imported here rather than at module level: it is only needed
+    to describe failures, and importing it costs more than enriching an IR.
+    """
+    from jsonschema import Draft202012Validator
+
+    schema = _load_schema(path)
+    # Checked once here so a broken schema fails loudly rather than per payload.
+    Draft202012Validator.check_schema(schema)
+    return Draft202012Validator(schema)
+
+
+@lru_cache(maxsize=4)
+def _get_compiled_validator(path: Path) -> Callable[[object], object]:
+    """Compile the pass/fail validator once per schema path.
+
+    Formats are not enforced, matching Draft202012Validator without a
+    format checker. An invalid schema raises JsonSchemaDefinitionException.
+    """
+    return fastjsonschema.compile(_load_schema(path), use_formats=False)
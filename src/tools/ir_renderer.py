@@ -32,13 +32,14 @@ def render_ir(ir: Union[IRModel, "SemanticIR"], renderer: str = "svg") -> Dict[s
         from src.tools.plantuml_renderer import plantuml_to_image
         plant = ir_to_plantuml(ir, diagram_type=renderer if renderer else "context")
         img = plantuml_to_image(plant)
-        # encode bytes as base64 string for transport in JSON-like dict
-        import base64
+        # encode bytes as base64 string for transport in JSON-like dict;
+        # b2a_base64 is the primitive behind base64.b64encode, minus the wrapper.
+        from binascii import b2a_base64
 
         return {
             "renderer": "plantuml",
             "plantuml": plant,
-            "image_base64": base64.b64encode(img).decode("ascii"),
+            "image_base64": b2a_base64(img, newline=False).decode("ascii"),
         }
 
     if IRModel is not None and isinstance(ir, IRModel):
@@ -3,9 +3,10 @@ from __future__ import annotations
 
 import re
 import xml.etree.ElementTree as ET
-from typing import List
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 
-ALLOWED_HEX_TOKENS = {
+ALLOWED_HEX_TOKENS = frozenset({
     "#0f172a",
     "#1e293b",
     "#334155",
@@ -14,7 +15,7 @@ ALLOWED_HEX_TOKENS = {
     "#94a3b8",
     "#e2e8f0",
     "#f8fafc",
-}
+})
 
 ALLOWED_STYLE_PREFIXES = (
     "var(",
@@ -22,7 +23,7 @@ ALLOWED_STYLE_PREFIXES = (
     "currentColor",
 )
 
-GRAPHIC_TAGS = {
+GRAPHIC_TAGS = frozenset({
     "path",
     "rect",
     "text",
@@ -31,21 +32,38 @@ GRAPHIC_TAGS = {
     "ellipse",
     "polygon",
     "polyline",
-}
+})
+
+
+_HEX_COLOR_RE = re.compile(r"#[0-9a-fA-F]{3,6}")
 
 
 class IRValidationError(ValueError):
     pass
 
 
+@lru_cache(maxsize=256)
 def _local_name(tag: str) -> str:
     if "}" in tag:
         return tag.split("}", 1)[1]
     return tag
 
 
+def _iter_with_parent(root: ET.Element) -> Iterator[Tuple[ET.Element, Optional[ET.Element]]]:
+    """Yield ``(element, parent)`` in document order, like ``root.iter()``."""
+    stack: List[Tuple[ET.Element, Optional[ET.Element]]] = [(root, None)]
+    while stack:
+        elem, parent = stack.pop()
+        yield elem, parent
+        stack.extend((child, elem) for child in reversed(elem))
+
+
 def _has_hex_color(value: str) -> bool:
-    return bool(re.search(r"#[0-9a-fA-F]{3,6}", value or ""))
+    # Most values ("none", "var(--x)") carry no "#" at all; the substring
+    # test settles those without entering the regex engine.
+    if not value or "#" not in value:
+        return False
+    return _HEX_COLOR_RE.search(value) is not None
 
 
 def validate_svg_ir(svg_text: str) -> None:
@@ -58,34 +76,32 @@ def validate_svg_ir(svg_text: str) -> None:
     if _local_name(root.tag) != "svg":
         errors.append("Root element must be <svg>.")
 
-    parent_map = {child: parent for parent in root.iter() for child in parent}
-
-    for elem in root.iter():
+    for elem, parent in _iter_with_parent(root):
         tag = _local_name(elem.tag)
+        attrib = elem.attrib
         if tag in {"animate", "animateTransform", "set"}:
             errors.append("Animation elements are not allowed.")
-        if "transform" in elem.attrib and "data-transform-reason" not in elem.attrib:
+        if "transform" in attrib and "data-transform-reason" not in attrib:
             errors.append(f"Transform without data-transform-reason on {tag}.")
 
         if tag == "g":
-            if "id" not in elem.attrib:
+            if "id" not in attrib:
                 errors.append("<g> elements must have an id.")
-            if "data-kind" not in elem.attrib:
-                errors.append(f"<g id='{elem.attrib.get('id', '')}'> missing data-kind.")
-            if "data-role" not in elem.attrib:
-                errors.append(f"<g id='{elem.attrib.get('id', '')}'> missing data-role.")
+            if "data-kind" not in attrib:
+                errors.append(f"<g id='{attrib.get('id', '')}'> missing data-kind.")
+            if "data-role" not in attrib:
+                errors.append(f"<g id='{attrib.get('id', '')}'> missing data-role.")
 
         if tag in GRAPHIC_TAGS:
-            parent = parent_map.get(elem)
             parent_tag = _local_name(parent.tag) if parent is not None else None
             if parent_tag != "g":
                 errors.append(f"{tag} must be inside a <g> group.")
-            if "id" not in elem.attrib:
+            if "id" not in attrib:
                 errors.append(f"{tag} elements must have an id.")
 
         for attr in ("fill", "stroke"):
-            if attr in elem.attrib:
-                value = elem.attrib[attr]
+            if attr in attrib:
+                value = attrib[attr]
                 if value and not value.startswith(ALLOWED_STYLE_PREFIXES):
                     if _has_hex_color(value):
                         if value.lower() not in ALLOWED_HEX_TOKENS:
@@ -94,10 +110,10 @@ def validate_svg_ir(svg_text: str) -> None:
                         errors.append(f"Non-token color in {attr}: {value}")
 
         if tag == "style" and elem.text:
-            if _has_hex_color(elem.text):
-                for match in re.findall(r"#[0-9a-fA-F]{3,6}", elem.text):
-                    if match.lower() not in ALLOWED_HEX_TOKENS:
-                        errors.append(f"Disallowed hex color in style: {match}")
+            # One error per distinct token, in order of first appearance.
+            for match in dict.fromkeys(_HEX_COLOR_RE.findall(elem.text)):
+                if match.lower() not in ALLOWED_HEX_TOKENS:
+                    errors.append(f"Disallowed hex color in style: {match}")
             if "@keyframes" in elem.text:
                 errors.append("Inline CSS animations are not allowed.")
 
@@ -1,38 +1,58 @@
 """PlantUML renderer tool."""
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import replace
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
 from uuid import UUID
 
 from src.models.architecture_plan import ArchitecturePlan
 from src.renderer import render_plantuml, render_plantuml_svg
 from src.renderers.mermaid_renderer import render_mermaid_svg_with_command
 from src.services.styling_audit_service import record_styling_audit
-from src.tools.diagram_validator import validate_and_sanitize
+from src.tools.diagram_validator import DiagramValidationResult, validate_and_sanitize
 from src.utils.config import settings
-from src.utils.file_utils import ensure_dir
+from src.utils.file_utils import atomic_write_bytes, ensure_dir_once
 
 
 _DEFAULT_DIAGRAM_TYPE = "system_context"
 
+# render_command recorded in the audit when a render was served from the cache.
+_RENDER_CACHE_HIT = "cache"
+
+# Matched against the lowercased text rather than with re.IGNORECASE, whose
+# Unicode case folding would also accept look-alikes such as U+017F for "s".
+_AESTHETIC_DIRECTIVE_RE = re.compile("skinparam|!theme|style|linetype|shadowing|bgcolor")
+
 
 def _validate_pure_plantuml(plantuml: str) -> None:
-    lowered = plantuml.lower()
-    disallowed = ["skinparam", "!theme", "skinparam", "style", "linetype", "shadowing", "bgcolor"]
-    if any(token in lowered for token in disallowed):
+    if _AESTHETIC_DIRECTIVE_RE.search(plantuml.lower()):
         raise ValueError("PlantUML contains aesthetic directives. Structural diagrams must be neutral.")
 
 
+_SPACE_DASH_TO_UNDERSCORE = str.maketrans({" ": "_", "-": "_"})
+# \W is exactly "not str.isalnum() and not '_'", so this replaces the same
+# characters, one underscore each, as a per-character isalnum() loop would.
+_NON_ALIAS_CHAR_RE = re.compile(r"\W")
+
+
 def _sanitize_name(name: str) -> str:
-    return name.replace(" ", "_").replace("-", "_")
+    return name.translate(_SPACE_DASH_TO_UNDERSCORE)
 
 
 def _alias_for(label: str, used: Dict[str, int]) -> str:
     base = _sanitize_name(label) or "item"
     if not base[0].isalpha():
         base = f"n_{base}"
-    base = "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in base)
+    base = _NON_ALIAS_CHAR_RE.sub("_", base)
     count = used.get(base, 0)
     used[base] = count + 1
     return base if count == 0 else f"{base}_{count}"
@@ -59,40 +79,49 @@ def _render_element(element: str, label: str, alias: str) -> str:
     return f"{element} \"{label}\" as {alias}"
 
 
-def _zone_block(title: str, items: List[str], alias: str, aliases: Dict[str, str], zone_name: str, view: str | None = None) -> str:
-    lines = [f"package \"{title}\" as {alias} {{"]
+def _zone_block(
+    parts: List[str],
+    title: str,
+    items: List[str],
+    alias: str,
+    aliases: Dict[str, str],
+    zone_name: str,
+    view: str | None = None,
+) -> None:
+    """Append the package block for one zone to ``parts``, one line per entry."""
+    parts.append(f"package \"{title}\" as {alias} {{")
     # In component view, render all items as components for clarity
     if view == "component":
         element = "component"
     else:
         element = _element_for_zone(zone_name)
-    for item in items:
-        item_alias = aliases[item]
-        lines.append(f"  {_render_element(element, item, item_alias)}")
-    lines.append("}")
-    return "\n".join(lines)
+    parts.extend(f"  {_render_element(element, item, aliases[item])}" for item in items)
+    parts.append("}")
+
+
+_ALL_ZONES = ("clients", "edge", "core_services", "external_services", "data_stores")
+# Zones shown by each view; views not listed show every zone.
+_VIEW_ZONES: Dict[str, Tuple[str, ...]] = {
+    "container": ("edge", "core_services", "data_stores"),
+    "component": ("core_services",),
+    "sequence": ("clients", "edge", "core_services"),
+    "runtime": ("clients", "edge", "core_services"),
+}
 
 
 def _zone_items_for_view(plan: ArchitecturePlan, view: str) -> Dict[str, List[str]]:
-    zones = {
-        "clients": list(plan.zones.clients),
-        "edge": list(plan.zones.edge),
-        "core_services": list(plan.zones.core_services),
-        "external_services": list(plan.zones.external_services),
-        "data_stores": list(plan.zones.data_stores),
-    }
+    """Map each zone shown in ``view`` to its items.
+
+    The lists may be the plan's own, so callers copy one before mutating it.
+    """
+    zones = plan.zones
     if view == "system_context":
-        return {zone: (items[:1] if items else []) for zone, items in zones.items()}
-    if view == "container":
-        return {"edge": zones.get("edge", []), "core_services": zones.get("core_services", []), "data_stores": zones.get("data_stores", [])}
-    if view == "component":
-        return {"core_services": zones.get("core_services", [])}
-    if view in {"sequence", "runtime"}:
-        return {"clients": zones.get("clients", []), "edge": zones.get("edge", []), "core_services": zones.get("core_services", [])}
-    return {zone: items for zone, items in zones.items()}
+        return {zone: getattr(zones, zone)[:1] for zone in _ALL_ZONES}
+    return {zone: getattr(zones, zone) for zone in _VIEW_ZONES.get(view, _ALL_ZONES)}
 
 
 def _relationships(plan: ArchitecturePlan, aliases: Dict[str, str]) -> List[str]:
+    """Return one arrow line per relationship; the lines are the same for every view."""
     rels = []
     for rel in plan.relationships:
         arrow = "-->" if rel.type != "async" else "..>"
@@ -108,15 +137,63 @@ def generate_plantuml_from_plan(
     diagram_types: List[str] | None = None,
 ) -> List[dict]:
     overrides = overrides or {}
-    layout_override = overrides.get("layout")
+    # Only the override fields the generator reads go into the key, normalized
+    # so equivalent inputs share an entry.
     zone_order = overrides.get("zone_order")
+    diagrams = _generate_plantuml_cached(
+        _PlanKey(plan),
+        overrides.get("layout") or None,
+        tuple(zone_order) if isinstance(zone_order, list) and zone_order else None,
+        tuple(diagram_types) if diagram_types else None,
+    )
+    # Entries hold only str/int values, so shallow copies keep the cache safe
+    # from callers that annotate the returned dicts.
+    return [dict(diagram) for diagram in diagrams]
+
+
+class _PlanKey:
+    """Hashable stand-in for a plan, equal to any plan with the same JSON dump."""
+
+    __slots__ = ("plan", "fingerprint")
+
+    def __init__(self, plan: ArchitecturePlan):
+        self.plan = plan
+        self.fingerprint = plan.model_dump_json(by_alias=True)
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _PlanKey) and other.fingerprint == self.fingerprint
+
+
+@lru_cache(maxsize=256)
+def _generate_plantuml_cached(
+    plan_key: _PlanKey,
+    layout_override: str | None,
+    zone_order: Tuple[str, ...] | None,
+    diagram_types: Tuple[str, ...] | None,
+) -> Tuple[dict, ...]:
+    zone_order_list = list(zone_order) if zone_order else None
+    return tuple(_generate_plantuml(plan_key.plan, layout_override, zone_order_list, diagram_types))
+
+
+def _generate_plantuml(
+    plan: ArchitecturePlan,
+    layout_override: str | None,
+    zone_order: List[str] | None,
+    diagram_types: Tuple[str, ...] | None,
+) -> List[dict]:
     diagrams = []
+    zones = plan.zones
+    relationships = plan.relationships
+    group_by_zone = plan.visual_hints.group_by_zone
     zone_map = {
-        "clients": list(plan.zones.clients),
-        "edge": list(plan.zones.edge),
-        "core_services": list(plan.zones.core_services),
-        "external_services": list(plan.zones.external_services),
-        "data_stores": list(plan.zones.data_stores),
+        "clients": list(zones.clients),
+        "edge": list(zones.edge),
+        "core_services": list(zones.core_services),
+        "external_services": list(zones.external_services),
+        "data_stores": list(zones.data_stores),
     }
     default_order = ["clients", "edge", "core_services", "external_services", "data_stores"]
     if isinstance(zone_order, list) and zone_order:
@@ -143,40 +220,46 @@ def generate_plantuml_from_plan(
         if not zone_map.get("edge"):
             zone_map["edge"] = ["Gateway"]
 
-    labels: List[str] = []
-    for items in zone_map.values():
-        labels.extend(list(items))
-    for rel in plan.relationships:
-        labels.extend([rel.from_, rel.to])
+    # dict.fromkeys dedupes the labels while keeping first-seen order.
+    endpoints = chain.from_iterable((rel.from_, rel.to) for rel in relationships)
+    labels = dict.fromkeys(chain(chain.from_iterable(zone_map.values()), endpoints))
     used: Dict[str, int] = {}
-    aliases: Dict[str, str] = {}
-    for label in labels:
-        if label not in aliases:
-            aliases[label] = _alias_for(label, used)
+    aliases = {label: _alias_for(label, used) for label in labels}
+
+    # Everything below up to the view loop is the same for every view.
+    header = _diagram_header(plan, layout_override=layout_override)
+    node_to_zone: Dict[str, str] = {item: zone_name for zone_name, items in zone_map.items() for item in items}
+    # Relationship endpoints that live in a zone, in relationship order.
+    zoned_endpoints: List[Tuple[str, str]] = []
+    for rel in relationships:
+        for endpoint in (rel.from_, rel.to):
+            zone = node_to_zone.get(endpoint)
+            if zone:
+                zoned_endpoints.append((endpoint, zone))
+    # relationships are not filtered by view currently; they connect existing items
+    relationship_lines = _relationships(plan, aliases)
 
     for view in requested_views:
-        header = _diagram_header(plan, layout_override=layout_override)
         parts = [header]
         items_map = _zone_items_for_view(plan, view)
-        node_to_zone: Dict[str, str] = {}
-        for zone_name, items in zone_map.items():
-            for item in items:
-                node_to_zone[item] = zone_name
-        for rel in plan.relationships:
-            for endpoint in (rel.from_, rel.to):
-                zone = node_to_zone.get(endpoint)
-                if not zone:
-                    continue
-                items = items_map.setdefault(zone, [])
-                if endpoint not in items:
-                    items.append(endpoint)
-        if plan.visual_hints.group_by_zone:
+        # Set mirror of each zone list touched below; a zone gets one when its
+        # list is first replaced by a private copy that is safe to append to.
+        seen_in_zone: Dict[str, Set[str]] = {}
+        for endpoint, zone in zoned_endpoints:
+            seen = seen_in_zone.get(zone)
+            if seen is None:
+                items = items_map[zone] = list(items_map.get(zone, ()))
+                seen = seen_in_zone[zone] = set(items)
+            if endpoint not in seen:
+                seen.add(endpoint)
+                items_map[zone].append(endpoint)
+        if group_by_zone:
             zone_aliases: List[str] = []
             for zone_name in zone_order:
                 items = items_map.get(zone_name, [])
                 if items:
                     alias = f"zone_{zone_name}"
-                    parts.append(_zone_block(zone_name, items, alias, aliases, zone_name, view=view))
+                    _zone_block(parts, zone_name, items, alias, aliases, zone_name, view=view)
                     zone_aliases.append(alias)
             for idx in range(len(zone_aliases) - 1):
                 parts.append(f"{zone_aliases[idx]} -[hidden]-> {zone_aliases[idx + 1]}")
@@ -190,8 +273,7 @@ def generate_plantuml_from_plan(
                 # In component view, render flat items as components
                 element = "component" if view == "component" else _element_for_zone(zone_name)
                 parts.append(_render_element(element, item, item_alias))
-        # relationships are not filtered by view currently; they connect existing items
-        parts.extend(_relationships(plan, aliases))
+        parts.extend(relationship_lines)
         parts.append("@enduml")
         diagram_text = "\n".join(parts)
         diagrams.append(
@@ -206,64 +288,172 @@ def generate_plantuml_from_plan(
     return diagrams
 
 
+def _render_cache_file(ext: str, *key_parts: str) -> Path:
+    # Rendered images are keyed by a digest of everything that determines their
+    # bytes, so an unchanged diagram is copied instead of re-rendered.
+    digest = hashlib.sha256("\0".join(key_parts).encode("utf-8")).hexdigest()
+    return Path(settings.render_cache_dir) / f"{digest}.{ext}"
+
+
+def _restore_cached_render(cache_file: Path, target: Path) -> bool:
+    try:
+        shutil.copyfile(cache_file, target)
+    except FileNotFoundError:
+        return False
+    # Bump the mtime so pruning drops the least recently used entries first.
+    with suppress(FileNotFoundError):
+        os.utime(cache_file)
+    return True
+
+
+def _store_cached_render(cache_file: Path, data: bytes) -> None:
+    # Written atomically, so concurrent renders of the same diagram at worst
+    # both store identical bytes and readers never see a partial file.
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(cache_file, data)
+    _prune_render_cache(cache_file.parent, settings.render_cache_max_entries)
+
+
+def _prune_render_cache(cache_dir: Path, max_entries: int) -> None:
+    """Delete the oldest cache entries beyond ``max_entries``."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue  # in-flight atomic_write_bytes temp files
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, path in entries[: len(entries) - max_entries]:
+        Path(path).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=128)
+def _cached_validation(diagram_text: str, diagram_format: str) -> DiagramValidationResult:
+    return validate_and_sanitize(diagram_text, diagram_format)
+
+
+def _validate_diagram(diagram_text: str, diagram_format: str) -> DiagramValidationResult:
+    """``validate_and_sanitize`` memoized on the exact text; blocked diagrams still raise each time."""
+    cached = _cached_validation(diagram_text, diagram_format)
+    # Fresh lists so a caller editing the result cannot change the cached one.
+    return replace(cached, warnings=list(cached.warnings), blocked_tokens=list(cached.blocked_tokens))
+
+
+def _write_text_if_changed(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` unless the file already holds exactly that text."""
+    data = text.encode("utf-8")
+    try:
+        # The size check settles most changed files without reading them.
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+
+
+def _render_plantuml_file(plantuml_text: str, file_name: str, output_dir: Path, output_format: str) -> str:
+    """Render ``plantuml_text`` to ``{file_name}.svg``/``.png``, reusing a cached render when possible."""
+    ext = "svg" if output_format == "svg" else "png"
+    target = output_dir / f"{file_name}.{ext}"
+    cache_file = _render_cache_file(ext, "plantuml", settings.plantuml_server_url, plantuml_text)
+    if _restore_cached_render(cache_file, target):
+        return str(target)
+    if output_format == "svg":
+        image_path = render_plantuml_svg(plantuml_text, file_name)
+    else:
+        image_path = render_plantuml(plantuml_text, file_name)
+    _store_cached_render(cache_file, Path(image_path).read_bytes())
+    return image_path
+
+
 def render_diagrams(
     diagrams: List[dict],
     output_name: str,
     output_format: str = "svg",
     audit_context: Dict[str, Any] | None = None,
 ) -> List[str]:
-    output_dir = ensure_dir(settings.output_dir)
+    output_dir = ensure_dir_once(settings.output_dir)
+    jobs = [
+        (idx, diagram, f"{output_name}_{diagram.get('type', 'diagram').replace(' ', '_')}_{idx + 1}")
+        for idx, diagram in enumerate(diagrams)
+    ]
     files = []
-    for idx, diagram in enumerate(diagrams):
-        diagram_type = diagram.get("type", "diagram").replace(" ", "_")
-        file_name = f"{output_name}_{diagram_type}_{idx + 1}"
-        llm_payload = diagram.get("llm_diagram")
-        llm_text: str | None = None
-        fmt = diagram.get("format")
-        if isinstance(llm_payload, dict):
-            fmt = llm_payload.get("format") or fmt
-            llm_text = (llm_payload.get("diagram") or llm_payload.get("text") or "").strip() or None
-        elif llm_payload:
-            llm_text = str(llm_payload)
-        if not llm_text:
-            plantuml_text = diagram.get("plantuml")
-            if plantuml_text:
-                llm_text = plantuml_text
-                fmt = fmt or "plantuml"
-
-        if llm_text:
-            image_path, sanitized_text, warnings, resolved_fmt, render_command = _render_llm_diagram(
-                llm_text,
-                fmt,
-                file_name,
-                output_dir,
-                output_format,
-            )
-            files.append(str(image_path))
-            _maybe_record_llm_audit(
-                audit_context,
-                diagram_plan_id=diagram.get("plan_id"),
-                diagram_type=diagram.get("type"),
-                llm_format=resolved_fmt,
-                llm_text=llm_text,
-                sanitized_text=sanitized_text,
-                warnings=warnings,
-                render_command=render_command,
-            )
-            continue
-
-        plantuml = diagram.get("plantuml") or "@startuml\n@enduml"
-        _validate_pure_plantuml(plantuml)
-        if output_format == "svg":
-            image_path = render_plantuml_svg(plantuml, file_name)
-        else:
-            image_path = render_plantuml(plantuml, file_name)
-        files.append(str(image_path))
-        puml_path = Path(output_dir) / f"{file_name}.puml"
-        puml_path.write_text(plantuml, encoding="utf-8")
+    if len(jobs) <= 1 or settings.max_render_workers <= 1:
+        for _, diagram, file_name in jobs:
+            image_path, audit = _render_one(diagram, file_name, output_dir, output_format)
+            files.append(image_path)
+            if audit:
+                _maybe_record_llm_audit(audit_context, **audit)
+        return files
+
+    # Renders wait on the PlantUML server or the Mermaid container, so they
+    # overlap well in threads. Results are consumed in diagram order and audits
+    # are recorded here, keeping DB writes on the calling thread.
+    with ThreadPoolExecutor(max_workers=min(len(jobs), settings.max_render_workers)) as executor:
+        futures = [
+            executor.submit(_render_one, diagram, file_name, output_dir, output_format)
+            for _, diagram, file_name in jobs
+        ]
+        for future in futures:
+            image_path, audit = future.result()
+            files.append(image_path)
+            if audit:
+                _maybe_record_llm_audit(audit_context, **audit)
     return files
 
 
+def _render_one(
+    diagram: dict,
+    file_name: str,
+    output_dir: Path,
+    output_format: str,
+) -> tuple[str, Dict[str, Any] | None]:
+    """Render one ``render_diagrams`` entry; return its path and any LLM audit fields."""
+    llm_payload = diagram.get("llm_diagram")
+    llm_text: str | None = None
+    fmt = diagram.get("format")
+    if isinstance(llm_payload, dict):
+        fmt = llm_payload.get("format") or fmt
+        llm_text = (llm_payload.get("diagram") or llm_payload.get("text") or "").strip() or None
+    elif llm_payload:
+        llm_text = str(llm_payload)
+    if not llm_text:
+        plantuml_text = diagram.get("plantuml")
+        if plantuml_text:
+            llm_text = plantuml_text
+            fmt = fmt or "plantuml"
+
+    if llm_text:
+        image_path, sanitized_text, warnings, resolved_fmt, render_command = _render_llm_diagram(
+            llm_text,
+            fmt,
+            file_name,
+            output_dir,
+            output_format,
+        )
+        return str(image_path), {
+            "diagram_plan_id": diagram.get("plan_id"),
+            "diagram_type": diagram.get("type"),
+            "llm_format": resolved_fmt,
+            "llm_text": llm_text,
+            "sanitized_text": sanitized_text,
+            "warnings": warnings,
+            "render_command": render_command,
+        }
+
+    plantuml = diagram.get("plantuml") or "@startuml\n@enduml"
+    _validate_pure_plantuml(plantuml)
+    image_path = _render_plantuml_file(plantuml, file_name, output_dir, output_format)
+    puml_path = Path(output_dir) / f"{file_name}.puml"
+    _write_text_if_changed(puml_path, plantuml)
+    return str(image_path), None
+
+
 def render_diagram_by_type(diagrams: List[dict], diagram_type: str, output_name: str, output_format: str = "svg") -> List[str]:
     selected = [d for d in diagrams if d.get("type") == diagram_type]
     if not selected:
@@ -297,24 +487,27 @@ def _render_llm_diagram(
     else:
         raise ValueError(f"Unsupported diagram format '{diagram_format}'")
 
-    validation = validate_and_sanitize(diagram_text, fmt)
+    validation = _validate_diagram(diagram_text, fmt)
     sanitized = validation.sanitized_text
     warnings = validation.warnings
 
     if fmt == "plantuml":
-        if output_format == "svg":
-            image_path = render_plantuml_svg(sanitized, file_name)
-        else:
-            image_path = render_plantuml(sanitized, file_name)
-        (output_dir / f"{file_name}.puml").write_text(sanitized, encoding="utf-8")
+        image_path = _render_plantuml_file(sanitized, file_name, output_dir, output_format)
+        _write_text_if_changed(output_dir / f"{file_name}.puml", sanitized)
         return str(image_path), sanitized, warnings, fmt, None
 
     if output_format != "svg":
         raise ValueError("Mermaid diagrams only support SVG output")
-    svg_text, render_command = render_mermaid_svg_with_command(sanitized)
     svg_path = output_dir / f"{file_name}.svg"
-    svg_path.write_text(svg_text, encoding="utf-8")
-    (output_dir / f"{file_name}.mmd").write_text(sanitized, encoding="utf-8")
+    # Keyed on the renderer image too, so switching mermaid-cli versions re-renders.
+    cache_file = _render_cache_file("svg", "mermaid", settings.mermaid_renderer_image, sanitized)
+    render_command = _RENDER_CACHE_HIT
+    if not _restore_cached_render(cache_file, svg_path):
+        svg_text, render_command = render_mermaid_svg_with_command(sanitized)
+        svg_bytes = svg_text.encode("utf-8")
+        svg_path.write_bytes(svg_bytes)
+        _store_cached_render(cache_file, svg_bytes)
+    _write_text_if_changed(output_dir / f"{file_name}.mmd", sanitized)
     return str(svg_path), sanitized, warnings, fmt, render_command
 
 
@@ -337,7 +530,9 @@ def _maybe_record_llm_audit(
     if not (db and session_id and plan_id):
         return
     execution_steps = [f"Validated {llm_format} diagram before rendering."]
-    if render_command:
+    if render_command == _RENDER_CACHE_HIT:
+        execution_steps.append("Restored from the render cache; no renderer was run.")
+    elif render_command:
         execution_steps.append(f"Rendered via docker: {render_command}")
     record_styling_audit(
         db,
@@ -371,14 +566,11 @@ def render_llm_plantuml(
     output_format: str = "svg",
 ) -> dict:
     """Render PlantUML supplied directly by an LLM after validation."""
-    validation = validate_and_sanitize(diagram_text, "plantuml")
-    if output_format == "svg":
-        image_path = render_plantuml_svg(validation.sanitized_text, output_name)
-    else:
-        image_path = render_plantuml(validation.sanitized_text, output_name)
-    output_dir = ensure_dir(settings.output_dir)
+    validation = _validate_diagram(diagram_text, "plantuml")
+    output_dir = ensure_dir_once(settings.output_dir)
+    image_path = _render_plantuml_file(validation.sanitized_text, output_name, output_dir, output_format)
     puml_path = Path(output_dir) / f"{output_name}.puml"
-    puml_path.write_text(validation.sanitized_text, encoding="utf-8")
+    _write_text_if_changed(puml_path, validation.sanitized_text)
     return {
         "file_path": str(image_path),
         "diagram_type": diagram_type,
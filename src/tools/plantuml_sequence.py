@@ -2,6 +2,8 @@
 from typing import Any, Dict, List
 import re
 
+_NON_ID_CHARS_RE = re.compile(r"[^0-9a-zA-Z_]+")
+
 
 def generate_plantuml_sequence_from_architecture(architecture_plan: Dict[str, Any]) -> str:
     """Generate a neutral PlantUML sequence diagram directly from the plan."""
@@ -13,7 +15,7 @@ def generate_plantuml_sequence_from_architecture(architecture_plan: Dict[str, An
     lines: List[str] = ["@startuml", ""]
 
     def _sanitize_id(raw: str) -> str:
-        s = re.sub(r"[^0-9a-zA-Z_]+", "_", raw or "node").strip("_")
+        s = _NON_ID_CHARS_RE.sub("_", raw or "node").strip("_")
         if not s:
             s = "node"
         # ensure it doesn't start with a digit
@@ -12,7 +12,7 @@ import xml.etree.ElementTree as ET
 from src.models.architecture_plan import ArchitecturePlan
 from src.tools.ir_validator import validate_svg_ir
 from src.utils.config import settings
-from src.utils.file_utils import ensure_dir
+from src.utils.file_utils import atomic_write_bytes, ensure_dir
 
 
 @dataclass(frozen=True)
@@ -333,7 +333,7 @@ def ir_to_svg(ir: IRModel) -> str:
 def render_ir_svg(svg_text: str, output_name: str) -> str:
     output_dir = ensure_dir(settings.output_dir)
     output_path = Path(output_dir) / f"{output_name}.svg"
-    output_path.write_text(svg_text, encoding="utf-8")
+    atomic_write_bytes(output_path, svg_text.encode("utf-8"))
     return str(output_path)
 
 
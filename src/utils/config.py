@@ -27,6 +27,10 @@ class Settings(BaseSettings):
     mermaid_renderer_image: str = "minlag/mermaid-cli"
     structurizr_renderer_image: str = "archviz-structurizr-renderer:latest"
     output_dir: str = "outputs"
+    # Rendered-diagram cache; kept out of output_dir, which is served publicly.
+    render_cache_dir: str = ".cache/renders"
+    render_cache_max_entries: int = 512  # Oldest entries are pruned beyond this
+    max_render_workers: int = 4  # Diagrams rendered concurrently by render_diagrams
     default_diagram_type: str = "sequence"
     enable_ir: bool = True  # Enable IR pipeline by default
     enable_ir_enrichment: bool = True  # Use enriched IR payloads when available
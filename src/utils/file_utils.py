@@ -1,6 +1,9 @@
 """File utilities."""
 from __future__ import annotations
 
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -11,6 +14,48 @@ def ensure_dir(path: str) -> Path:
     return p
 
 
+@lru_cache(maxsize=8)
+def ensure_dir_once(path: str) -> Path:
+    """Like ``ensure_dir`` but only hits the filesystem the first time per path.
+
+    Intended for long-lived directories such as ``settings.output_dir``; call
+    ``ensure_dir_once.cache_clear()`` if such a directory may be removed.
+    """
+    return ensure_dir(path)
+
+
+# Read once at import: os.umask can only be queried by setting it, which is
+# not safe to do from concurrent threads later on.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _new_file_mode(path: Path) -> int:
+    """Mode a plain ``open(path, "wb")`` would leave: keep the target's, else umask-derived."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write ``data`` to a temp sibling and ``os.replace`` it over ``path``.
+
+    Readers see either the old or the new contents, never a partial file.
+    The result keeps the permissions a direct write would have had, rather
+    than ``mkstemp``'s owner-only 0600.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, _new_file_mode(path))
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 # Conservative binary extensions that we should not attempt to decode as UTF-8
 BINARY_EXTENSIONS = {
     ".png",
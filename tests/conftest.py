@@ -0,0 +1,10 @@
+import pytest
+
+from src.utils.config import settings
+
+
+@pytest.fixture(autouse=True)
+def _isolated_render_cache(tmp_path_factory, monkeypatch):
+    # Keep rendered-diagram cache entries out of the working tree and
+    # independent between tests.
+    monkeypatch.setattr(settings, "render_cache_dir", str(tmp_path_factory.mktemp("render-cache")))
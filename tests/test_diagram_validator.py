@@ -91,3 +91,59 @@ def test_sanitize_mermaid_quotes_labels_with_braces():
     result = validate_and_sanitize(mermaid_with_braces, "mermaid")
     assert 'X["Config {json}"]' in result.sanitized_text
     assert "Y[Output]" in result.sanitized_text
+
+
+def test_validate_plantuml_keeps_markers_outside_edge_window():
+    """Markers preceded/followed by long comment lines must not be re-added."""
+    padding = "' " + "x" * 120
+    diagram = f"{padding}\n@startuml\nA -> B\n@enduml\n{padding}"
+    result = validate_and_sanitize(diagram, "plantuml")
+    assert result.sanitized_text.count("@startuml") == 1
+    assert result.sanitized_text.count("@enduml") == 1
+    assert result.warnings == []
+
+
+def test_validate_plantuml_adds_missing_markers():
+    result = validate_and_sanitize("A -> B", "plantuml")
+    assert result.sanitized_text == "@startuml\nA -> B\n@enduml"
+    assert result.warnings == ["Added @startuml", "Added @enduml"]
+
+
+def test_validate_plantuml_reports_each_blocked_directive_once_in_order():
+    diagram = """@startuml
+skinparam stylesheet x
+!include a.puml
+!INCLUDE b.puml
+A -> B : url(file://etc)
+@enduml"""
+    with pytest.raises(DiagramValidationError) as excinfo:
+        validate_and_sanitize(diagram, "plantuml")
+    assert excinfo.value.result.blocked_tokens[:4] == [
+        "!include",
+        "skinparam stylesheet",
+        "url(...)",
+        "file URI",
+    ]
+
+
+def test_validate_mermaid_blocks_case_folded_javascript_uri():
+    diagram = 'graph LR\n  A --> B\n  click A "javascrıpt:alert(1)"'
+    with pytest.raises(DiagramValidationError) as excinfo:
+        validate_and_sanitize(diagram, "mermaid")
+    assert excinfo.value.result.blocked_tokens == ["javascript URI"]
+
+
+def test_validate_plantuml_skinparams_match_case_insensitively():
+    diagram = "@startuml\nSKINPARAM RoundCorner 10\nskinparam BackgroundColor red\nA -> B\n@enduml"
+    with pytest.raises(DiagramValidationError) as excinfo:
+        validate_and_sanitize(diagram, "plantuml")
+    assert excinfo.value.result.blocked_tokens == ["skinparam BackgroundColor"]
+
+
+def test_validate_fast_fail_reports_first_blocked_directive_only():
+    diagram = "@startuml\nskinparam stylesheet x\n!include a.puml\nA -> B : url(x)\n@enduml"
+    with pytest.raises(DiagramValidationError) as excinfo:
+        validate_and_sanitize(diagram, "plantuml", fast_fail=True)
+    assert excinfo.value.result.blocked_tokens == ["skinparam stylesheet"]
+
+    assert validate_and_sanitize(PLANTUML_ALLOWED, "plantuml", fast_fail=True).blocked_tokens == []
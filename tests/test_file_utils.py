@@ -0,0 +1,24 @@
+import stat
+
+from src.utils import file_utils
+from src.utils.file_utils import atomic_write_bytes
+
+
+def test_atomic_write_bytes_uses_umask_mode_for_new_files(tmp_path):
+    target = tmp_path / "new.json"
+    atomic_write_bytes(target, b"{}")
+
+    assert target.read_bytes() == b"{}"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o666 & ~file_utils._UMASK
+
+
+def test_atomic_write_bytes_keeps_existing_mode(tmp_path):
+    target = tmp_path / "existing.json"
+    target.write_bytes(b"old")
+    target.chmod(0o640)
+
+    atomic_write_bytes(target, b"new")
+
+    assert target.read_bytes() == b"new"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["existing.json"]
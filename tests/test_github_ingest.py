@@ -0,0 +1,53 @@
+import subprocess
+
+from src.tools.github_ingest import ingest_github_repo
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _make_repo(path):
+    files = {
+        "package.json": "{}",
+        "README.md": "demo",
+        "api/pyproject.toml": "",
+        "api/app.py": "",
+        "api/models.py": "",
+        "web/src/index.ts": "",
+        "web/src/view.tsx": "",
+        "web/node_modules/dep/index.js": "",
+        "docs/.py": "",
+    }
+    for rel, content in files.items():
+        target = path / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    _git(path, "init", "-q")
+    _git(path, "add", "-A")
+    _git(path, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-q", "-m", "init")
+
+
+def test_ingest_github_repo_summarizes_tree(tmp_path):
+    repo = tmp_path / "demo.git"
+    repo.mkdir()
+    _make_repo(repo)
+
+    result = ingest_github_repo(f"file://{repo}?ref=main#readme")
+    summary = result["summary"]
+
+    assert result["repo_url"] == f"file://{repo}"
+    assert summary["repo_name"] == "demo"
+    assert summary["top_level_dirs"] == ["api", "docs", "web"]
+    assert summary["key_files"] == ["api/pyproject.toml", "package.json"]
+    assert summary["languages"] == {"Python": 2, "TypeScript": 2}
+    assert summary["services"] == ["api"]
+    assert summary["entrypoints"] == ["api/app.py", "web/src/index.ts"]
+    assert "Languages: Python(2), TypeScript(2)" in result["content"]
+    assert result["content"].splitlines()[3:] == [
+        "Top-level directories: api, docs, web",
+        "Key files: api/pyproject.toml, package.json",
+        "Languages: Python(2), TypeScript(2)",
+        "Services (monorepo roots): api",
+        "Entrypoints: api/app.py, web/src/index.ts",
+    ]
@@ -0,0 +1,65 @@
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from src.tools import image_versioning
+from src.utils.config import settings
+
+
+def test_add_version_rewrites_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+
+    image_versioning.add_version("demo", "a.png")
+    versions = image_versioning.add_version("demo", "b.png")
+    assert versions == [{"version": 1, "file": "a.png"}, {"version": 2, "file": "b.png"}]
+    # The manifest on disk is always current for other readers.
+    assert json.loads((tmp_path / "demo_images.json").read_text()) == versions
+
+
+def test_set_versions_leaves_no_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    image_versioning.set_versions("atomic", [{"version": 1, "file": "a.png"}])
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["atomic_images.json", "atomic_images.lock"]
+    assert json.loads((tmp_path / "atomic_images.json").read_text()) == [{"version": 1, "file": "a.png"}]
+
+
+def test_load_versions_reloads_after_external_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    image_versioning.set_versions("shared", [{"version": 1, "file": "a.png"}])
+    assert len(image_versioning.load_versions("shared")) == 1
+
+    (tmp_path / "shared_images.json").write_text(
+        json.dumps([{"version": 1, "file": "a.png"}, {"version": 2, "file": "other-process.png"}])
+    )
+    assert [v["file"] for v in image_versioning.load_versions("shared")] == ["a.png", "other-process.png"]
+
+
+def test_add_version_assigns_unique_versions_across_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: image_versioning.add_version("threads", f"{i}.png"), range(40)))
+
+    versions = image_versioning.load_versions("threads")
+    assert [v["version"] for v in versions] == list(range(1, 41))
+    assert sorted(v["file"] for v in versions) == sorted(f"{i}.png" for i in range(40))
+
+
+def _add_versions_in_child(output_dir, prefix):
+    settings.output_dir = output_dir
+    for i in range(10):
+        image_versioning.add_version("procs", f"{prefix}{i}.png")
+
+
+def test_add_version_assigns_unique_versions_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_add_versions_in_child, args=(str(tmp_path), p)) for p in "abc"]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    versions = image_versioning.load_versions("procs")
+    assert [v["version"] for v in versions] == list(range(1, 31))
@@ -64,3 +64,24 @@ def test_validate_enriched_ir_reports_schema_errors():
     errors = validate_enriched_ir(invalid)
     assert errors
     assert any("diagram_type" in err for err in errors)
+
+
+def test_relationship_node_roles_follow_keyword_priority():
+    enriched = enrich_ir({
+        "relationships": [
+            {"from": "Cachedge Proxy", "to": "Auth Store"},
+            {"from": "Order Processor", "to": "MongoDB"},
+        ],
+    })
+    roles = {node["label"]: node["role"] for node in enriched["nodes"]}
+    # Overlapping keywords: "edge" (gateway) outranks "cache" (data_store).
+    assert roles["Cachedge Proxy"] == "gateway"
+    assert roles["Auth Store"] == "data_store"
+    assert roles["Order Processor"] == "service"
+    assert roles["MongoDB"] == "data_store"
+
+
+def test_colliding_labels_get_distinct_node_ids():
+    enriched = enrich_ir({"zones": {"clients": ["User", "User!", "User 2", "User?"]}})
+    ids = {node["label"]: node["node_id"] for node in enriched["nodes"]}
+    assert ids == {"User": "user", "User!": "user_2", "User 2": "user_2_2", "User?": "user_3"}
@@ -25,3 +25,22 @@ def test_generate_component_diagram():
     assert "@startuml" in diagrams[0]["plantuml"]
     assert "component \"Client\"" in diagrams[0]["plantuml"]
     assert "Client --> Service" in diagrams[0]["plantuml"]
+
+
+def test_generate_returns_fresh_dicts_for_repeated_plans():
+    plan = ArchitecturePlan.model_validate(
+        {
+            "system_name": "Test",
+            "diagram_views": ["container"],
+            "zones": {"edge": ["Gateway"], "core_services": ["Service"]},
+            "relationships": [{"from": "Gateway", "to": "Service", "type": "sync", "description": "calls"}],
+            "visual_hints": {"layout": "top-down"},
+        }
+    )
+    first = generate_plantuml_from_plan(plan)
+    first[0]["plantuml"] = "mutated"
+    second = generate_plantuml_from_plan(plan)
+    assert second[0]["plantuml"].startswith("@startuml\ntop to bottom direction")
+
+    plan.zones.core_services.append("Worker")
+    assert 'component "Worker"' in generate_plantuml_from_plan(plan)[0]["plantuml"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from uuid import uuid4
 
@@ -66,3 +67,126 @@ def test_render_diagrams_handles_mermaid_llm(monkeypatch, tmp_path):
     svg_path = Path(files[0])
     assert svg_path.read_text(encoding="utf-8") == "<svg>mermaid</svg>"
     assert svg_path.with_suffix(".mmd").read_text(encoding="utf-8").startswith("graph LR")
+
+
+def test_render_diagrams_reuses_cached_render(monkeypatch, tmp_path):
+    monkeypatch.setattr(pr.settings, "output_dir", str(tmp_path))
+    calls: list[str] = []
+
+    def fake_render_plantuml_svg(diagram_text: str, output_name: str) -> str:
+        calls.append(output_name)
+        svg_path = Path(tmp_path) / f"{output_name}.svg"
+        svg_path.write_text("<svg>cached</svg>", encoding="utf-8")
+        return str(svg_path)
+
+    monkeypatch.setattr(pr, "render_plantuml_svg", fake_render_plantuml_svg)
+    diagrams = [{"type": "container", "plantuml": "@startuml\nA -> B\n@enduml"}]
+
+    first = pr.render_diagrams(diagrams, "first")
+    second = pr.render_diagrams(diagrams, "second")
+
+    assert calls == ["first_container_1"]
+    assert Path(second[0]).name == "second_container_1.svg"
+    assert Path(second[0]).read_text(encoding="utf-8") == Path(first[0]).read_text(encoding="utf-8")
+
+    pr.render_diagrams([{"type": "container", "plantuml": "@startuml\nA -> C\n@enduml"}], "third")
+    assert calls == ["first_container_1", "third_container_1"]
+
+
+def test_render_diagrams_keeps_order_when_rendering_concurrently(monkeypatch, tmp_path):
+    monkeypatch.setattr(pr.settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(pr.settings, "max_render_workers", 3)
+
+    def fake_render_plantuml_svg(diagram_text: str, output_name: str) -> str:
+        svg_path = Path(tmp_path) / f"{output_name}.svg"
+        svg_path.write_text(f"<svg>{output_name}</svg>", encoding="utf-8")
+        return str(svg_path)
+
+    audited: list[str] = []
+    monkeypatch.setattr(pr, "render_plantuml_svg", fake_render_plantuml_svg)
+    monkeypatch.setattr(pr, "record_styling_audit", lambda db, **kwargs: audited.append(kwargs["diagram_type"]))
+
+    diagrams = [
+        {"type": view, "llm_diagram": f"@startuml\n{view} -> B\n@enduml", "format": "plantuml"}
+        for view in ("context", "container", "component", "runtime")
+    ]
+    files = pr.render_diagrams(
+        diagrams,
+        "many",
+        audit_context={"db": object(), "session_id": uuid4(), "plan_id": uuid4()},
+    )
+
+    assert [Path(f).name for f in files] == [
+        "many_context_1.svg",
+        "many_container_2.svg",
+        "many_component_3.svg",
+        "many_runtime_4.svg",
+    ]
+    assert audited == ["context", "container", "component", "runtime"]
+
+
+def test_render_diagrams_leaves_unchanged_source_file_alone(monkeypatch, tmp_path):
+    monkeypatch.setattr(pr.settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(pr, "render_mermaid_svg_with_command", lambda text: ("<svg>mermaid</svg>", "docker run --rm ..."))
+    diagrams = [{"type": "flow", "llm_diagram": "graph LR; A-->B;", "format": "mermaid"}]
+
+    pr.render_diagrams(diagrams, "same")
+    source = tmp_path / "same_flow_1.mmd"
+    os.utime(source, ns=(0, 0))
+    pr.render_diagrams(diagrams, "same")
+    assert source.stat().st_mtime_ns == 0
+
+    pr.render_diagrams([{"type": "flow", "llm_diagram": "graph LR; A-->C;", "format": "mermaid"}], "same")
+    assert "A-->C" in source.read_text(encoding="utf-8")
+
+
+def test_mermaid_render_cache_is_keyed_on_renderer_image(monkeypatch, tmp_path):
+    monkeypatch.setattr(pr.settings, "output_dir", str(tmp_path))
+    calls: list[str] = []
+
+    def fake_render(text: str) -> tuple[str, str]:
+        calls.append(pr.settings.mermaid_renderer_image)
+        return "<svg>mermaid</svg>", "docker run --rm ..."
+
+    monkeypatch.setattr(pr, "render_mermaid_svg_with_command", fake_render)
+    diagrams = [{"type": "flow", "llm_diagram": "graph LR; A-->B;", "format": "mermaid"}]
+
+    pr.render_diagrams(diagrams, "img")
+    pr.render_diagrams(diagrams, "img")
+    monkeypatch.setattr(pr.settings, "mermaid_renderer_image", "minlag/mermaid-cli:11")
+    pr.render_diagrams(diagrams, "img")
+
+    assert calls == [calls[0], "minlag/mermaid-cli:11"]
+
+
+def test_render_cache_lives_outside_output_dir_and_is_bounded(monkeypatch, tmp_path):
+    output_dir = tmp_path / "outputs"
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(pr.settings, "output_dir", str(output_dir))
+    monkeypatch.setattr(pr.settings, "render_cache_dir", str(cache_dir))
+    monkeypatch.setattr(pr.settings, "render_cache_max_entries", 2)
+
+    def fake_render(text: str) -> tuple[str, str]:
+        return f"<svg>{text}</svg>", "docker run --rm ..."
+
+    monkeypatch.setattr(pr, "render_mermaid_svg_with_command", fake_render)
+    for index in range(4):
+        pr.render_diagrams([{"type": "flow", "llm_diagram": f"graph LR; A-->N{index};", "format": "mermaid"}], f"img{index}")
+
+    assert sorted(p.name for p in output_dir.iterdir() if p.is_dir()) == []
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_mermaid_cache_hit_is_recorded_in_audit(monkeypatch, tmp_path):
+    monkeypatch.setattr(pr.settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(pr, "render_mermaid_svg_with_command", lambda text: ("<svg />", "docker run --rm mmdc"))
+    steps: list[list[str]] = []
+    monkeypatch.setattr(pr, "record_styling_audit", lambda db, **kwargs: steps.append(kwargs["execution_steps"]))
+    audit_context = {"db": object(), "session_id": uuid4(), "plan_id": uuid4()}
+    diagrams = [{"type": "flow", "llm_diagram": "graph LR; A-->B;", "format": "mermaid"}]
+
+    pr.render_diagrams(diagrams, "first", audit_context=audit_context)
+    pr.render_diagrams(diagrams, "second", audit_context=audit_context)
+
+    assert steps[0][-1] == "Rendered via docker: docker run --rm mmdc"
+    assert steps[1][-1] == "Restored from the render cache; no renderer was run."
@@ -14,7 +14,7 @@ def test_render_plantuml(monkeypatch, tmp_path):
     def mock_get(*args, **kwargs):
         return mock_response
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     from src.utils import config
 
     config.settings.output_dir = str(tmp_path)
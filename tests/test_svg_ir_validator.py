@@ -79,3 +79,16 @@ def test_ir_validator_rejects_hex_color():
         assert False, "Expected validation error"
     except IRValidationError as exc:
         assert "Disallowed hex color" in str(exc)
+
+
+def test_ir_validator_reports_repeated_style_color_once():
+    bad_svg = """
+    <svg xmlns='http://www.w3.org/2000/svg'>
+      <style>.a{fill:#ff00ff;} .b{stroke:#ff00ff;} .c{fill:#0f172a;} .d{fill:#123}</style>
+    </svg>
+    """
+    try:
+        validate_svg_ir(bad_svg)
+        assert False, "Expected validation error"
+    except IRValidationError as exc:
+        assert str(exc) == "Disallowed hex color in style: #ff00ff; Disallowed hex color in style: #123"